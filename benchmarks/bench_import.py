@@ -0,0 +1,108 @@
+"""Measure import time and memory of generated model modules.
+
+Compares one module in dependency order (only cycle-closing keys
+deferred), one module in file order with every key to a later model
+deferred, and a lazily loaded package from which a single model is used. Each import runs in a
+fresh interpreter, cold (`-B`, source compiled every time) and warm
+(from `__pycache__`). Needs peewee and psycopg2 (for
+`playhouse.postgres_ext`) installed.
+
+Usage: python -m benchmarks.bench_import [--tables 5000] [--fields 60000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from erd_converter.base.table import Table
+from erd_converter.convert import convert_tables_to, read_tables
+from erd_converter.peewee.package import BASE_SOURCE, write_package
+from erd_converter.peewee.utils import get_peewee_table_class_name
+
+from .generate import write_schema
+
+
+MEASURE = '''
+import json, sys, time, tracemalloc
+sys.path.insert(0, {directory!r})
+if {trace}:
+    tracemalloc.start()
+started = time.perf_counter()
+import {module} as models
+getattr(models, {model!r})
+seconds = time.perf_counter() - started
+current, peak = tracemalloc.get_traced_memory() if {trace} else (0, 0)
+print(json.dumps({{'seconds': seconds, 'current': current, 'peak': peak}}))
+'''
+
+
+def _measure(directory: Path, module: str, model: str, cold: bool, trace: bool) -> dict[str, float]:
+    code = MEASURE.format(directory=str(directory), module=module, model=model, trace=trace)
+    command = [sys.executable] + (['-B'] if cold else []) + ['-c', code]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def _write_module(directory: Path, tables: list[Table], sort: bool, defer_forward: bool) -> None:
+    directory.mkdir()
+    with open(directory / 'models.py', 'w') as f:
+        f.write(BASE_SOURCE)
+        convert_tables_to(tables, f, sort=sort, defer_forward=defer_forward)
+
+
+def run(tables: int, fields: int, repeat: int) -> dict[str, dict[str, float]]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        schema = root / 'schema.dbml'
+        write_schema(str(schema), tables, fields)
+        base_tables = read_tables(schema)
+        model = get_peewee_table_class_name(base_tables[-1].name)
+
+        _write_module(root / 'sorted', base_tables, sort=True, defer_forward=False)
+        _write_module(root / 'deferred', base_tables, sort=False, defer_forward=True)
+        (root / 'package').mkdir()
+        write_package(base_tables, root / 'package' / 'models')
+        variants = {
+            'sorted': root / 'sorted',
+            'deferred': root / 'deferred',
+            'package': root / 'package',
+        }
+
+        results = {}
+        for name, directory in variants.items():
+            cold = min(_measure(directory, 'models', model, cold=True, trace=False)['seconds'] for _ in range(repeat))
+            # the first warm run writes __pycache__
+            _measure(directory, 'models', model, cold=False, trace=False)
+            warm = min(_measure(directory, 'models', model, cold=False, trace=False)['seconds'] for _ in range(repeat))
+            memory = _measure(directory, 'models', model, cold=False, trace=True)
+            results[name] = {'cold': cold, 'warm': warm, 'peak_bytes': memory['peak'], 'current_bytes': memory['current']}
+            for cache in directory.rglob('__pycache__'):
+                shutil.rmtree(cache)
+
+    print(f'{"":>10} {"cold s":>9} {"warm s":>9} {"peak MiB":>9} {"kept MiB":>9}')
+    for name, result in results.items():
+        print(
+            f'{name:>10} {result["cold"]:9.3f} {result["warm"]:9.3f} '
+            f'{result["peak_bytes"] / 2**20:9.1f} {result["current_bytes"] / 2**20:9.1f}'
+        )
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=5000)
+    parser.add_argument('--fields', type=int, default=60_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', type=Path, help='Also write the results to this file.')
+    args = parser.parse_args()
+    if importlib.util.find_spec('peewee') is None or importlib.util.find_spec('psycopg2') is None:
+        sys.exit('peewee and psycopg2 are required to import the generated models: pip install peewee psycopg2-binary')
+    results = run(args.tables, args.fields, args.repeat)
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2))
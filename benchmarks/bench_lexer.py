@@ -0,0 +1,44 @@
+"""Compare the single-pass field lexer with the regex dispatch it replaced.
+
+Usage: python -m benchmarks.bench_lexer [repeat]
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+
+from erd_converter.uml import field as uml_field
+from erd_converter.uml.utils import get_data_type
+
+
+LINES = [
+    'id int [pk]',
+    'name varchar',
+    'description varchar(512) [null]',
+    'count int [not null]',
+    'is_enabled boolean [null]',
+    'user_id int [null, ref: > user.id]',
+    'dependents array[varchar(512) [null]]',
+    'flags json [null]',
+    'created_at datetime',
+    'ratio float [null]',
+    'payload bytea',
+]
+
+
+def regex_dispatch(line: str) -> uml_field.UMLField:
+    return uml_field.DATA_TYPES[get_data_type(line)].from_str(line)
+
+
+def run(repeat: int = 20_000) -> dict[str, float]:
+    results = {}
+    for name, func in (('regex', regex_dispatch), ('lexer', uml_field.create_uml_field)):
+        seconds = min(timeit.repeat(lambda: [func(line) for line in LINES], number=repeat, repeat=3))
+        results[name] = seconds
+        print(f'{name:>6}: {len(LINES) * repeat / seconds:,.0f} fields/s')
+    print(f'speedup: {results["regex"] / results["lexer"]:.2f}x')
+    return results
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,80 @@
+"""Measure memory held per field by the UML, base and Peewee object graphs.
+
+Usage: python -m benchmarks.bench_memory [--tables 200] [--fields 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+import typing as tp
+
+from erd_converter.base.store import SchemaStore
+from erd_converter.peewee.table import PeeweeTable
+from erd_converter.uml.store import add_table_lines
+from erd_converter.uml.table import UMLTable
+
+from .generate import generate_schema
+
+
+def _blocks(tables: int, fields: int) -> list[list[str]]:
+    blocks = []
+    lines: list[str] = []
+    for line in generate_schema(tables, fields):
+        line = line.strip()
+        if not line:
+            continue
+        lines.append(line)
+        if line == '}':
+            blocks.append(lines)
+            lines = []
+    return blocks
+
+
+def measure(build: tp.Callable[[], tp.Any]) -> tuple[tp.Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def run(tables: int, fields: int) -> dict[str, float]:
+    blocks = _blocks(tables, fields)
+    field_count = sum(len(block) - 2 for block in blocks)
+
+    uml_tables, uml_bytes = measure(lambda: [UMLTable.from_str(block) for block in blocks])
+    base_tables, base_bytes = measure(lambda: [table.to_table() for table in uml_tables])
+    peewee_tables, peewee_bytes = measure(lambda: [PeeweeTable.from_table(table) for table in base_tables])
+
+    def build_store() -> SchemaStore:
+        store = SchemaStore()
+        for block in blocks:
+            add_table_lines(store, block)
+        return store
+
+    store, store_bytes = measure(build_store)
+
+    results = {
+        'uml': uml_bytes / field_count,
+        'base': base_bytes / field_count,
+        'peewee': peewee_bytes / field_count,
+    }
+    print(f'{field_count:,} fields')
+    for name, per_field in results.items():
+        print(f'{name:>7}: {per_field:7.1f} bytes/field')
+    print(f'{"total":>7}: {sum(results.values()):7.1f} bytes/field')
+    results['store'] = store_bytes / field_count
+    print(f'{"store":>7}: {results["store"]:7.1f} bytes/field (SchemaStore, names included)')
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=200)
+    parser.add_argument('--fields', type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.tables, args.fields)
@@ -0,0 +1,58 @@
+"""Measure Peewee rendering throughput on wide tables.
+
+Usage: python -m benchmarks.bench_render [--tables 200] [--fields 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+import typing as tp
+
+from erd_converter.peewee.table import PeeweeTable, render_tables_to
+from erd_converter.uml.table import UMLTable
+
+from .bench_memory import _blocks
+
+
+def _time(func: tp.Callable[[], tp.Any], repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(tables: int, fields: int) -> dict[str, float]:
+    peewee_tables = [PeeweeTable.from_table(UMLTable.from_str(block).to_table()) for block in _blocks(tables, fields)]
+    field_count = sum(len(table.fields) for table in peewee_tables)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'models.py')
+
+        def write_strings() -> None:
+            with open(path, 'w') as f:
+                f.writelines(str(table) for table in peewee_tables)
+
+        def render_to_file() -> None:
+            with open(path, 'w') as f:
+                render_tables_to(peewee_tables, f)
+
+        results = {
+            'str': _time(write_strings),
+            'render_to': _time(render_to_file),
+        }
+
+    for name, seconds in results.items():
+        print(f'{name:>16}: {field_count / seconds:12,.0f} fields/s')
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=200)
+    parser.add_argument('--fields', type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.tables, args.fields)
@@ -0,0 +1,80 @@
+"""Deterministic generator of large synthetic DBML schemas.
+
+Usage: python -m benchmarks.generate --tables 10000 --fields 1000000 -o big.dbml
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import typing as tp
+
+
+# (kind, weight) roughly matching the type mix of our production schemas
+TYPE_MIX = (
+    ('varchar', 30),
+    ('int', 22),
+    ('fk', 15),
+    ('boolean', 8),
+    ('datetime', 8),
+    ('json', 5),
+    ('array', 5),
+    ('float', 4),
+    ('bytea', 3),
+)
+
+
+def _field(rng: random.Random, kind: str, index: int, table_count: int) -> str:
+    null = ' [null]' if rng.random() < 0.3 else ''
+    if kind == 'varchar':
+        size = rng.choice(('', '(64)', '(128)', '(512)'))
+        return f'field_{index} varchar{size}{null}'
+    if kind == 'fk':
+        target = rng.randrange(table_count)
+        nullable = 'null, ' if null else ''
+        return f'table_{target}_id_{index} int [{nullable}ref: > table_{target}.id]'
+    if kind == 'array':
+        subtype = rng.choice(('int', 'boolean', 'varchar', 'varchar(64) [null]'))
+        return f'field_{index} array[{subtype}]'
+    return f'field_{index} {kind}{null}'
+
+
+def generate_schema(tables: int, fields: int, seed: int = 0) -> tp.Iterator[str]:
+    """Yield the lines of a schema with `tables` tables and about `fields` fields in total.
+
+    Table sizes follow a skewed distribution so a few tables are much wider
+    than the rest, like real schemas.
+    """
+    rng = random.Random(seed)
+    kinds, weights = zip(*TYPE_MIX)
+    sizes = [rng.paretovariate(1.5) for _ in range(tables)]
+    scale = max(fields - tables, 0) / sum(sizes) if tables else 0
+    for t, size in enumerate(sizes):
+        yield f'table table_{t} {{\n'
+        yield '  id int [pk]\n'
+        for i in range(round(size * scale)):
+            kind = rng.choices(kinds, weights)[0]
+            yield f'  {_field(rng, kind, i, tables)}\n'
+        yield '}\n\n'
+
+
+def write_schema(path: str, tables: int, fields: int, seed: int = 0) -> None:
+    with open(path, 'w') as f:
+        f.writelines(generate_schema(tables, fields, seed))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=1000)
+    parser.add_argument('--fields', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='-')
+    args = parser.parse_args(argv)
+    if args.output == '-':
+        sys.stdout.writelines(generate_schema(args.tables, args.fields, args.seed))
+    else:
+        write_schema(args.output, args.tables, args.fields, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Time each conversion stage on a generated schema and compare against a baseline.
+
+Usage:
+    python -m benchmarks.run --tables 10000 --fields 1000000 -o result.json
+    python -m benchmarks.run --baseline result.json --threshold 0.1
+
+The run exits with status 1 when a stage got slower than the baseline by
+more than `--threshold` (relative).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import typing as tp
+
+from erd_converter.peewee.table import PeeweeTable
+from erd_converter.uml.index import TableSpans, scan_table_spans
+from erd_converter.uml.iterator import table_lines
+from erd_converter.uml.table import UMLTable
+
+from .generate import write_schema
+
+
+STAGES = ('frame', 'iterate', 'parse', 'to_table', 'from_table', 'render', 'write')
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+
+    def run(self, stage: str, func: tp.Callable[[], tp.Any]) -> tp.Any:
+        started = time.perf_counter()
+        result = func()
+        self.seconds[stage] = time.perf_counter() - started
+        return result
+
+
+def run_pipeline(path: str, out_path: str) -> dict[str, float]:
+    timer = StageTimer()
+
+    def frame() -> tuple[bytes, TableSpans]:
+        with open(path, 'rb') as f:
+            data = f.read()
+        return data, scan_table_spans(data)
+
+    data, spans = timer.run('frame', frame)
+    blocks = timer.run('iterate', lambda: [table_lines(data[start:end].decode()) for _, start, end in spans])
+    uml_tables = timer.run('parse', lambda: [UMLTable.from_str(lines) for lines in blocks])
+    tables = timer.run('to_table', lambda: [table.to_table() for table in uml_tables])
+    peewee_tables = timer.run('from_table', lambda: [PeeweeTable.from_table(table) for table in tables])
+    rendered = timer.run('render', lambda: [str(table) for table in peewee_tables])
+
+    def write() -> None:
+        with open(out_path, 'w') as f:
+            f.writelines(rendered)
+
+    timer.run('write', write)
+    return timer.seconds
+
+
+def best_of(repeat: int, func: tp.Callable[[], dict[str, float]]) -> dict[str, float]:
+    runs = [func() for _ in range(repeat)]
+    return {stage: min(run[stage] for run in runs) for stage in STAGES}
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every stage slower than `baseline` by more than `threshold`."""
+    regressions = []
+    for stage, seconds in result['stages'].items():
+        base = baseline['stages'].get(stage)
+        if not base:
+            continue
+        ratio = seconds / base
+        if ratio > 1 + threshold:
+            regressions.append(f'{stage}: {base:.3f}s -> {seconds:.3f}s ({ratio - 1:+.1%})')
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=1000)
+    parser.add_argument('--fields', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--schema', help='Use this DBML file instead of generating one.')
+    parser.add_argument('-o', '--output', help='Write the JSON result here.')
+    parser.add_argument('--baseline', help='JSON result to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        schema = args.schema
+        if schema is None:
+            schema = os.path.join(tmp_dir, 'schema.dbml')
+            write_schema(schema, args.tables, args.fields, args.seed)
+        out_path = os.path.join(tmp_dir, 'models.py')
+        stages = best_of(args.repeat, lambda: run_pipeline(schema, out_path))
+
+    result = {
+        'params': {'tables': args.tables, 'fields': args.fields, 'seed': args.seed, 'schema': args.schema},
+        'python': platform.python_version(),
+        'stages': stages,
+        'total': sum(stages.values()),
+    }
+    for stage in STAGES:
+        print(f'{stage:>10}: {stages[stage]:8.3f}s')
+    print(f'{"total":>10}: {result["total"]:8.3f}s')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import io
+import os
+import typing as tp
+
+from erd_converter.convert import render_block, sorted_texts
+from erd_converter.uml.aio import DEFAULT_CHUNK_SIZE, AsyncByteStream, iterate_blocks
+
+
+Source = tp.Union[bytes, str, os.PathLike, AsyncByteStream]
+
+
+class BytesStream:
+    """Async byte stream over an in-memory document."""
+
+    def __init__(self, data: bytes) -> None:
+        self.__buffer = io.BytesIO(data)
+
+    async def read(self, n: int = -1) -> bytes:
+        return self.__buffer.read(n)
+
+
+class FileStream:
+    """Async byte stream over a file, each read running in `executor`."""
+
+    def __init__(self, path: str | os.PathLike, executor: concurrent.futures.Executor | None = None) -> None:
+        self.__path = path
+        self.__executor = executor
+        self.__file: tp.BinaryIO | None = None
+
+    async def read(self, n: int = -1) -> bytes:
+        loop = asyncio.get_running_loop()
+        if self.__file is None:
+            self.__file = await loop.run_in_executor(self.__executor, open, self.__path, 'rb')
+        data = await loop.run_in_executor(self.__executor, self.__file.read, n)
+        if not data:
+            self.__file.close()
+        return data
+
+
+def render_blocks(blocks: list[bytes]) -> str:
+    return ''.join(render_block(block) for block in blocks)
+
+
+def render_texts(blocks: list[bytes]) -> list[str]:
+    return [render_block(block) for block in blocks]
+
+
+def join_sorted(blocks: list[bytes], texts: list[str]) -> str:
+    return ''.join(sorted_texts(blocks, texts))
+
+
+def as_stream(source: Source) -> AsyncByteStream:
+    if isinstance(source, bytes):
+        return BytesStream(source)
+    if isinstance(source, (str, os.PathLike)):
+        return FileStream(source)
+    return source
+
+
+async def convert(
+    source: Source,
+    executor: concurrent.futures.Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sort: bool = True,
+) -> str:
+    """Convert a DBML document to Peewee models without blocking the event loop.
+
+    `source` is the document bytes, a file path or an async byte stream.
+    Parsing and rendering run in `executor`, one call per chunk of tables.
+    With `sort` (as the CLI) models are emitted in foreign key dependency
+    order once the whole document was read (see `sorted_texts`), otherwise
+    in file order, which only imports if no model references a later one.
+    """
+    loop = asyncio.get_running_loop()
+    if not sort:
+        parts = []
+        async for blocks in iterate_blocks(as_stream(source), chunk_size):
+            parts.append(await loop.run_in_executor(executor, render_blocks, blocks))
+        return ''.join(parts)
+
+    all_blocks: list[bytes] = []
+    texts: list[str] = []
+    async for blocks in iterate_blocks(as_stream(source), chunk_size):
+        all_blocks.extend(blocks)
+        texts.extend(await loop.run_in_executor(executor, render_texts, blocks))
+    return await loop.run_in_executor(executor, join_sorted, all_blocks, texts)
+
+
+class AsyncConverter:
+    """Convert many documents concurrently, at most `limit` at a time.
+
+    The limit bounds how many documents are buffered and parsed at once, so
+    memory stays flat when hundreds of requests arrive together.
+    """
+
+    def __init__(self, executor: concurrent.futures.Executor | None = None, limit: int = 8, sort: bool = True) -> None:
+        self.executor = executor
+        self.limit = limit
+        self.sort = sort
+        self.__semaphore = asyncio.Semaphore(limit)
+
+    async def convert(self, source: Source) -> str:
+        async with self.__semaphore:
+            return await convert(source, executor=self.executor, sort=self.sort)
+
+    async def convert_many(self, sources: tp.Iterable[Source]) -> list[str]:
+        return list(await asyncio.gather(*(self.convert(source) for source in sources)))
@@ -1,6 +1,7 @@
 from .base_field import BaseField
 from .base_table import BaseTable
 from .field import Field, Integer, Varchar, ForeignKeyField, Boolean, Array, Json, DateTime, Float, Bytes
+from .store import SchemaStore
 from .table import Table
 
 
@@ -9,6 +10,7 @@ __all__ = [
     'Field',
     'BaseTable',
     'Table',
+    'SchemaStore',
     'Integer',
     'Varchar',
     'ForeignKeyField',
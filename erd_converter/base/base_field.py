@@ -1,29 +1,45 @@
 from __future__ import annotations
 
 import abc
-import dataclasses
+import functools
 import typing as tp
 
 from typing_extensions import Self
 
+from .converter import Converter, get_converter
+
 
 T = tp.TypeVar('T')
 
 
 class BaseField(abc.ABC, tp.Generic[T]):
-    
+    __slots__ = ()
+
     @classmethod
     def model_type(cls) -> type[T]:
-        return tp.get_args(cls.__orig_bases__[0])[0]
+        return _model_type(cls)
 
     def to_field(self) -> T:
-        model_type = self.model_type()
-        return model_type(**dataclasses.asdict(self))
+        return to_field_converter(self.__class__)(self)
 
     @classmethod
     def from_field(cls, field: T) -> Self:
-        return cls(**dataclasses.asdict(field))
+        return get_converter(field.__class__, cls)(field)
 
     @abc.abstractclassmethod
     def from_str(cls, line: str) -> Self:
         ...
+
+
+@functools.cache
+def _model_type(cls: type[BaseField[T]]) -> type[T]:
+    return tp.get_args(cls.__orig_bases__[0])[0]
+
+
+@functools.cache
+def to_field_converter(cls: type[BaseField[T]]) -> Converter:
+    """Return the function converting instances of `cls` to its base field class."""
+    if cls.to_field is not BaseField.to_field:
+        # e.g. arrays convert their subfield themselves
+        return cls.to_field
+    return get_converter(cls, _model_type(cls))
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import abc
+import functools
 import typing as tp
 
 from typing_extensions import Self
 
 from .table import Table
-from .base_field import BaseField
+from .base_field import BaseField, to_field_converter
+from .converter import Converter, get_converter
 from .field import Field
 
 
@@ -15,17 +17,29 @@ F = tp.TypeVar('F', bound=BaseField)
 
 
 class BaseTable(abc.ABC):
+    __slots__ = ()
+
     name: str
     fields: list[F]
     field_convert: tp.ClassVar[dict[type[T], type[F]]]
 
     def to_table(self) -> Table:
-        return Table(name=self.name, fields=[field.to_field() for field in self.fields])
-
-    @classmethod
-    def __convert_field(cls, field: Field) -> F:
-        return cls.field_convert[field.__class__].from_field(field)
+        return Table(name=self.name, fields=[to_field_converter(field.__class__)(field) for field in self.fields])
 
     @classmethod
     def from_table(cls, table: Table) -> Self:
-        return cls(name=table.name, fields=[cls.__convert_field(field) for field in table.fields])
+        converters = _field_converters(cls)
+        return cls(name=table.name, fields=[converters[field.__class__](field) for field in table.fields])
+
+
+@functools.cache
+def _field_converters(table_cls: type[BaseTable]) -> dict[type, Converter]:
+    """Map each base field class to the function converting it for `table_cls`."""
+    converters = {}
+    for source, target in table_cls.field_convert.items():
+        if target.from_field.__func__ is BaseField.from_field.__func__:
+            converters[source] = get_converter(source, target)
+        else:
+            # e.g. arrays convert their subfield themselves
+            converters[source] = target.from_field
+    return converters
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import typing as tp
+import zlib
+from array import array
+from pathlib import Path
+
+from .store import COLUMNS, SchemaStore
+
+
+SCHEMA_SUFFIX = '.erds'
+MAGIC = b'ERDS'
+FORMAT_VERSION = 1
+
+# magic, version, big endian flag, section count, crc32 of everything after the header
+HEADER = struct.Struct('<4sHBxII')
+# typecode, item size, offset from the start of the file, size in bytes
+SECTION = struct.Struct('<cB6xQQ')
+ALIGNMENT = 8
+
+# the string table is stored as `offsets` into one utf-8 `blob`
+SECTIONS = ('name_offsets', 'name_blob') + COLUMNS
+
+
+class SchemaFormatError(ValueError):
+    pass
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def _sections(store: SchemaStore) -> list[memoryview]:
+    blob = bytearray()
+    offsets = array('I', [0])
+    for name in store.names:
+        blob += name.encode()
+        offsets.append(len(blob))
+    # columns are arrays, or memoryviews when the store was loaded itself
+    return [memoryview(offsets), memoryview(blob)] + [memoryview(getattr(store, column)) for column in COLUMNS]
+
+
+def dumps(store: SchemaStore) -> bytes:
+    """Serialize `store` into the compiled schema format.
+
+    Layout: a fixed header, a directory with one entry per section, then the
+    raw (native byte order, 8-byte aligned) contents of the string table and
+    of every column of `COLUMNS`.
+    """
+    sections = _sections(store)
+    offset = HEADER.size + SECTION.size * len(sections)
+    offset += _padding(offset)
+    directory = bytearray()
+    body = bytearray()
+    for section in sections:
+        data = section.tobytes()
+        directory += SECTION.pack(section.format.encode(), section.itemsize, offset + len(body), len(data))
+        body += data
+        body += bytes(_padding(len(data)))
+    payload = bytes(directory) + bytes(_padding(HEADER.size + len(directory))) + bytes(body)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder == 'big', len(sections), zlib.crc32(payload))
+    return header + payload
+
+
+def dump(store: SchemaStore, path: str | Path) -> None:
+    """Write `store` to `path` atomically."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(store))
+    os.replace(tmp_path, path)
+
+
+def loads(buffer: tp.Any, verify: bool = True, copy: bool = False) -> SchemaStore:
+    """Read a store from a compiled schema held in `buffer` (bytes, mmap, ...).
+
+    Unless `copy` (or the file was written with the other byte order) the
+    columns are `memoryview`s over `buffer`, so nothing but the names is
+    copied and the store is read-only.
+    """
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise SchemaFormatError('Truncated compiled schema')
+    magic, version, big_endian, count, checksum = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SchemaFormatError('Not a compiled schema')
+    if version != FORMAT_VERSION:
+        raise SchemaFormatError(f'Unsupported compiled schema version {version}')
+    if count != len(SECTIONS):
+        raise SchemaFormatError(f'Expected {len(SECTIONS)} sections, found {count}')
+    if verify and zlib.crc32(view[HEADER.size:]) != checksum:
+        raise SchemaFormatError('Checksum mismatch, the compiled schema is corrupted')
+    swap = bool(big_endian) != (sys.byteorder == 'big')
+
+    sections: dict[str, tp.Sequence[int]] = {}
+    for i, name in enumerate(SECTIONS):
+        typecode, itemsize, offset, size = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+        typecode = typecode.decode()
+        if array(typecode).itemsize != itemsize:
+            raise SchemaFormatError(f'Section `{name}` has items of {itemsize} bytes, expected {array(typecode).itemsize}')
+        if offset + size > len(view):
+            raise SchemaFormatError(f'Section `{name}` is out of bounds')
+        data = view[offset:offset + size]
+        if copy or swap:
+            column = array(typecode)
+            column.frombytes(data)
+            if swap:
+                column.byteswap()
+            sections[name] = column
+        else:
+            sections[name] = data.cast(typecode)
+
+    blob = bytes(sections.pop('name_blob'))
+    offsets = sections.pop('name_offsets')
+    names = [blob[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1)]
+    return SchemaStore.from_columns(names, sections)
+
+
+def load(path: str | Path, verify: bool = True, copy: bool = False) -> SchemaStore:
+    """Memory-map the compiled schema at `path` and read it with `loads`."""
+    with open(path, 'rb') as f:
+        if copy:
+            return loads(f.read(), verify=verify, copy=True)
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            raise SchemaFormatError('Truncated compiled schema') from None
+    # the columns keep the mapping alive
+    return loads(buffer, verify=verify)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import typing as tp
+
+
+Converter = tp.Callable[[tp.Any], tp.Any]
+
+
+def build_converter(source: type, target: type) -> Converter:
+    """Generate a function building a `target` from the same-named attributes of a `source`.
+
+    Attributes of `source` unknown to `target` are dropped and missing
+    optional ones take their defaults. Values are passed by reference, so
+    the cost is one attribute read per field plus the `target` constructor.
+    """
+    source_names = {field.name for field in dataclasses.fields(source)}
+    args = []
+    for field in dataclasses.fields(target):
+        if not field.init:
+            continue
+        if field.name in source_names:
+            args.append(f'{field.name}=src.{field.name}')
+        elif field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING:
+            raise TypeError(f'Cannot convert {source.__name__} to {target.__name__}: no `{field.name}`')
+
+    namespace = {'target': target}
+    code = f'def convert(src):\n    return target({", ".join(args)})\n'
+    exec(code, namespace)
+    convert = namespace['convert']
+    convert.__qualname__ = f'convert_{source.__name__}_to_{target.__name__}'
+    return convert
+
+
+@functools.cache
+def get_converter(source: type, target: type) -> Converter:
+    """Return the cached converter from `source` to `target`, building it on first use."""
+    return build_converter(source, target)
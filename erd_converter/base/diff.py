@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import dataclasses
+import typing as tp
+
+from .field import ForeignKeyField
+from .table import Table
+
+
+def comparable(field: tp.Any) -> tp.Any:
+    """`field` without the attributes generated models do not carry.
+
+    A foreign key's column type and DBML `ref` operator are not represented
+    in a Peewee model, so a schema compared with models generated from it
+    shows no change.
+    """
+    if isinstance(field, ForeignKeyField):
+        return dataclasses.replace(field, type='', ref_operator='')
+    return field
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class FieldChange:
+    old: tp.Any
+    new: tp.Any
+
+    @property
+    def name(self) -> str:
+        return self.new.name
+
+    @property
+    def only_nullable(self) -> bool:
+        """True when the fields differ in `nullable` alone."""
+        if self.old.__class__ is not self.new.__class__ or not hasattr(self.new, 'nullable'):
+            return False
+        return dataclasses.replace(self.old, nullable=self.new.nullable) == self.new
+
+
+@dataclasses.dataclass
+class TableChange:
+    name: str
+    added: list[tp.Any] = dataclasses.field(default_factory=lambda: [])
+    removed: list[tp.Any] = dataclasses.field(default_factory=lambda: [])
+    changed: list[FieldChange] = dataclasses.field(default_factory=lambda: [])
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclasses.dataclass
+class SchemaDiff:
+    added: list[Table] = dataclasses.field(default_factory=lambda: [])
+    removed: list[Table] = dataclasses.field(default_factory=lambda: [])
+    changed: list[TableChange] = dataclasses.field(default_factory=lambda: [])
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def affected(self) -> set[str]:
+        """Names of the tables whose generated models differ: added or changed ones."""
+        return {table.name for table in self.added} | {change.name for change in self.changed}
+
+    def summary(self) -> str:
+        lines = [f'+ {table.name}' for table in self.added]
+        lines.extend(f'- {table.name}' for table in self.removed)
+        for change in self.changed:
+            lines.append(f'~ {change.name}')
+            lines.extend(f'    + {field.name}' for field in change.added)
+            lines.extend(f'    - {field.name}' for field in change.removed)
+            lines.extend(f'    ~ {field.name}' for field in change.changed)
+        return '\n'.join(lines)
+
+
+def diff_table(old: Table, new: Table) -> TableChange:
+    """Fields added, removed or changed between two versions of a table, matched by name."""
+    change = TableChange(new.name)
+    old_fields = {field.name: field for field in old.fields}
+    new_names = set()
+    for field in new.fields:
+        new_names.add(field.name)
+        previous = old_fields.get(field.name)
+        if previous is None:
+            change.added.append(field)
+        elif comparable(previous) != comparable(field):
+            change.changed.append(FieldChange(previous, field))
+    change.removed.extend(field for field in old.fields if field.name not in new_names)
+    return change
+
+
+def diff_tables(old: tp.Iterable[Table], new: tp.Iterable[Table]) -> SchemaDiff:
+    """Compare two schemas in time linear in their size.
+
+    Base fields are frozen dataclasses, so a table's fields form a hashable
+    tuple: unchanged tables (the common case) are recognised by one hash
+    and tuple comparison, and only the others are diffed field by field.
+    Column order and attributes dropped by `comparable` are not significant.
+    """
+    old_tables = {table.name: table for table in old}
+    diff = SchemaDiff()
+    seen = set()
+    for table in new:
+        seen.add(table.name)
+        previous = old_tables.get(table.name)
+        if previous is None:
+            diff.added.append(table)
+            continue
+        old_fields = tuple(map(comparable, previous.fields))
+        new_fields = tuple(map(comparable, table.fields))
+        if hash(old_fields) == hash(new_fields) and old_fields == new_fields:
+            continue
+        change = diff_table(previous, table)
+        if change:
+            diff.changed.append(change)
+    diff.removed.extend(table for name, table in old_tables.items() if name not in seen)
+    return diff
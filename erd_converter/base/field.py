@@ -3,7 +3,11 @@ from __future__ import annotations
 import dataclasses
 
 
-@dataclasses.dataclass
+# name given to the element field of an `Array`
+ARRAY_SUBFIELD_NAME = 'default'
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
 class Field:
     name: str
     type: str
@@ -12,14 +16,14 @@ class Field:
     reference: str | None = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Integer:
     name: str
     primary_key: bool = False
     nullable: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Varchar:
     name: str
     size: int
@@ -27,7 +31,7 @@ class Varchar:
     nullable: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class ForeignKeyField:
     name: str
     type: str
@@ -37,37 +41,37 @@ class ForeignKeyField:
     nullable: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Boolean:
     name: str
     nullable: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Float:
     name: str
     nullable: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Bytes:
     name: str
     nullable: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class DateTime:
     name: str
     nullable: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Array:
     name: str
     subfield: Integer | Boolean | Varchar
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Json:
     name: str
     nullable: bool = False
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import typing as tp
+
+from . import field as f
+from .table import Table
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Reference:
+    table: str
+    field: str
+    ref_table: str
+    ref_field: str
+
+
+@dataclasses.dataclass
+class Ordering:
+    """Table indices in dependency order plus the foreign keys that had to be deferred.
+
+    `deferred` maps a table index to the names of its fields whose target
+    is emitted later; they must use a deferred foreign key.
+    """
+    order: list[int]
+    deferred: dict[int, set[str]] = dataclasses.field(default_factory=dict)
+
+
+def topological_order(names: tp.Sequence[str], references: tp.Sequence[tp.Iterable[tuple[str, str]]]) -> Ordering:
+    """Order tables so every foreign key target comes before the table using it.
+
+    `references[i]` lists `(field, ref_table)` pairs of table `names[i]`.
+    Self references and unknown targets impose no order. Runs Kahn's
+    algorithm seeded in file order; when only cycles remain, the earliest
+    remaining table is emitted and its foreign keys to tables not emitted
+    yet are deferred. Linear in tables plus references.
+    """
+    index = {name: i for i, name in enumerate(names)}
+    count = len(names)
+    targets: list[dict[int, list[str]]] = [{} for _ in range(count)]
+    dependents: list[list[int]] = [[] for _ in range(count)]
+    for i, refs in enumerate(references):
+        for field, ref_table in refs:
+            j = index.get(ref_table)
+            if j is None or j == i:
+                continue
+            fields = targets[i].get(j)
+            if fields is None:
+                targets[i][j] = [field]
+                dependents[j].append(i)
+            else:
+                fields.append(field)
+
+    remaining = [len(t) for t in targets]
+    emitted = [False] * count
+    queue = collections.deque(i for i in range(count) if not remaining[i])
+    ordering = Ordering(order=[])
+    cursor = 0
+    while len(ordering.order) < count:
+        if not queue:
+            while emitted[cursor]:
+                cursor += 1
+            deferred = ordering.deferred.setdefault(cursor, set())
+            for j, fields in targets[cursor].items():
+                if not emitted[j]:
+                    deferred.update(fields)
+            queue.append(cursor)
+        i = queue.popleft()
+        if emitted[i]:
+            continue
+        emitted[i] = True
+        ordering.order.append(i)
+        for dependent in dependents[i]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0 and not emitted[dependent]:
+                queue.append(dependent)
+    return ordering
+
+
+class SchemaIndex:
+    """Lookup tables for a whole schema built in one pass.
+
+    `tables` maps a table name to its table and `fields` maps
+    `(table, field)` to the field, so every `ref:` target resolves in O(1).
+    """
+
+    def __init__(self, tables: tp.Iterable[Table]) -> None:
+        self.table_list: list[Table] = []
+        self.tables: dict[str, Table] = {}
+        self.fields: dict[tuple[str, str], tp.Any] = {}
+        self.references: list[Reference] = []
+        for table in tables:
+            self.table_list.append(table)
+            self.tables[table.name] = table
+            for field in table.fields:
+                self.fields[table.name, field.name] = field
+                if isinstance(field, f.ForeignKeyField):
+                    self.references.append(Reference(table.name, field.name, field.ref_table, field.ref_field))
+
+    def resolve(self, reference: Reference) -> tp.Any | None:
+        return self.fields.get((reference.ref_table, reference.ref_field))
+
+    def dangling(self) -> list[Reference]:
+        """References whose target table or field does not exist."""
+        return [ref for ref in self.references if (ref.ref_table, ref.ref_field) not in self.fields]
+
+    def ordering(self) -> Ordering:
+        refs_by_table: dict[str, list[tuple[str, str]]] = collections.defaultdict(list)
+        for ref in self.references:
+            refs_by_table[ref.table].append((ref.field, ref.ref_table))
+        names = [table.name for table in self.table_list]
+        return topological_order(names, [refs_by_table.get(name, ()) for name in names])
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import bisect
+import enum
+import itertools
+import operator
+import typing as tp
+from array import array
+
+from . import field as f
+from .field import ARRAY_SUBFIELD_NAME
+from .table import Table
+
+
+class TypeCode(enum.IntEnum):
+    INTEGER = 1
+    VARCHAR = 2
+    FOREIGN_KEY = 3
+    BOOLEAN = 4
+    FLOAT = 5
+    BYTES = 6
+    DATETIME = 7
+    ARRAY = 8
+    JSON = 9
+
+
+TYPE_CODES: dict[type, TypeCode] = {
+    f.Integer: TypeCode.INTEGER,
+    f.Varchar: TypeCode.VARCHAR,
+    f.ForeignKeyField: TypeCode.FOREIGN_KEY,
+    f.Boolean: TypeCode.BOOLEAN,
+    f.Float: TypeCode.FLOAT,
+    f.Bytes: TypeCode.BYTES,
+    f.DateTime: TypeCode.DATETIME,
+    f.Array: TypeCode.ARRAY,
+    f.Json: TypeCode.JSON,
+}
+FIELD_TYPES: dict[TypeCode, type] = {code: cls for cls, code in TYPE_CODES.items()}
+
+NULLABLE = 1
+PRIMARY_KEY = 2
+# flags of an array's subfield
+SUB_NULLABLE = 4
+SUB_PRIMARY_KEY = 8
+
+NO_NAME = -1
+
+# per-field and per-table `array` columns of a SchemaStore, in serialization order
+COLUMNS = (
+    'table_names',
+    'table_offsets',
+    'field_names',
+    'type_codes',
+    'flags',
+    'sizes',
+    'sub_types',
+    'fk_types',
+    'ref_table_names',
+    'ref_field_names',
+    'ref_operators',
+)
+
+
+class SchemaStore:
+    """Struct-of-arrays representation of a whole schema.
+
+    Every column is an `array.array` with one entry per field; fields of
+    table `t` occupy `table_offsets[t]:table_offsets[t + 1]`. Names live
+    once in an interned string table and columns only hold their ids, so a
+    field costs a few dozen bytes instead of a Python object graph.
+
+    Array fields keep their subfield in the `sub_type`, `SUB_*` flag bits
+    and `sizes` columns; foreign keys keep the target table and field
+    names, the raw column type and the `ref_operator` character code.
+    """
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.__name_ids: dict[str, int] = {}
+        self.table_names = array('i')
+        self.table_offsets = array('I', [0])
+        self.field_names = array('i')
+        self.type_codes = array('B')
+        self.flags = array('B')
+        self.sizes = array('I')
+        self.sub_types = array('B')
+        self.fk_types = array('i')
+        self.ref_table_names = array('i')
+        self.ref_field_names = array('i')
+        self.ref_operators = array('B')
+        self.__ref_tables: array | None = None
+        self.__table_ids: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.table_names)
+
+    @property
+    def field_count(self) -> int:
+        return len(self.field_names)
+
+    def intern(self, name: str) -> int:
+        try:
+            return self.__name_ids[name]
+        except KeyError:
+            name_id = self.__name_ids[name] = len(self.names)
+            self.names.append(name)
+            return name_id
+
+    def name_id(self, name: str) -> int:
+        return self.__name_ids.get(name, NO_NAME)
+
+    # building
+
+    def begin_table(self, name: str) -> int:
+        """Start a new table; following `add_field` calls append to it."""
+        name_id = self.intern(name)
+        index = len(self.table_names)
+        self.table_names.append(name_id)
+        self.table_offsets.append(self.table_offsets[-1])
+        self.__table_ids.setdefault(name_id, index)
+        self.__ref_tables = None
+        return index
+
+    def add_field(
+        self,
+        name: str,
+        type_code: TypeCode,
+        flags: int = 0,
+        size: int = 0,
+        sub_type: int = 0,
+        fk_type: str | None = None,
+        ref_table: str | None = None,
+        ref_field: str | None = None,
+        ref_operator: str = '\0',
+    ) -> None:
+        self.field_names.append(self.intern(name))
+        self.type_codes.append(type_code)
+        self.flags.append(flags)
+        self.sizes.append(size)
+        self.sub_types.append(sub_type)
+        self.fk_types.append(NO_NAME if fk_type is None else self.intern(fk_type))
+        self.ref_table_names.append(NO_NAME if ref_table is None else self.intern(ref_table))
+        self.ref_field_names.append(NO_NAME if ref_field is None else self.intern(ref_field))
+        self.ref_operators.append(ord(ref_operator))
+        self.table_offsets[-1] += 1
+        self.__ref_tables = None
+
+    def add_base_field(self, field: tp.Any) -> None:
+        code = TYPE_CODES[field.__class__]
+        flags = NULLABLE if getattr(field, 'nullable', False) else 0
+        if getattr(field, 'primary_key', False):
+            flags |= PRIMARY_KEY
+        if code is TypeCode.FOREIGN_KEY:
+            self.add_field(
+                field.name, code, flags,
+                fk_type=field.type,
+                ref_table=field.ref_table,
+                ref_field=field.ref_field,
+                ref_operator=field.ref_operator,
+            )
+        elif code is TypeCode.ARRAY:
+            subfield = field.subfield
+            if getattr(subfield, 'nullable', False):
+                flags |= SUB_NULLABLE
+            if getattr(subfield, 'primary_key', False):
+                flags |= SUB_PRIMARY_KEY
+            self.add_field(
+                field.name, code, flags,
+                size=getattr(subfield, 'size', 0),
+                sub_type=TYPE_CODES[subfield.__class__],
+            )
+        else:
+            self.add_field(field.name, code, flags, size=getattr(field, 'size', 0))
+
+    def add_table(self, table: Table) -> int:
+        index = self.begin_table(table.name)
+        for field in table.fields:
+            self.add_base_field(field)
+        return index
+
+    @classmethod
+    def from_tables(cls, tables: tp.Iterable[Table]) -> SchemaStore:
+        store = cls()
+        for table in tables:
+            store.add_table(table)
+        return store
+
+    @classmethod
+    def from_columns(cls, names: list[str], columns: tp.Mapping[str, tp.Sequence[int]]) -> SchemaStore:
+        """Build a store around existing `COLUMNS`, e.g. read from a compiled schema.
+
+        Columns may be read-only `memoryview`s, in which case the store
+        cannot be extended.
+        """
+        store = cls()
+        store.names = names
+        store.__name_ids = {name: i for i, name in enumerate(names)}
+        for column in COLUMNS:
+            setattr(store, column, columns[column])
+        for index, name_id in enumerate(store.table_names):
+            store.__table_ids.setdefault(name_id, index)
+        return store
+
+    # reading
+
+    @property
+    def ref_tables(self) -> array:
+        """Index of the table each foreign key points to, -1 for other fields or unknown tables."""
+        if self.__ref_tables is None:
+            table_ids = self.__table_ids
+            self.__ref_tables = array('i', (table_ids.get(name_id, -1) for name_id in self.ref_table_names))
+        return self.__ref_tables
+
+    def table_index(self, name: str) -> int:
+        try:
+            return self.__table_ids[self.__name_ids[name]]
+        except KeyError:
+            raise KeyError(f'Table `{name}` not found') from None
+
+    def table_name(self, index: int) -> str:
+        return self.names[self.table_names[index]]
+
+    def field_range(self, index: int) -> range:
+        return range(self.table_offsets[index], self.table_offsets[index + 1])
+
+    def table_of(self, field_index: int) -> int:
+        return bisect.bisect_right(self.table_offsets, field_index) - 1
+
+    def field(self, i: int) -> tp.Any:
+        names = self.names
+        code = TypeCode(self.type_codes[i])
+        flags = self.flags[i]
+        name = names[self.field_names[i]]
+        nullable = bool(flags & NULLABLE)
+        if code is TypeCode.INTEGER:
+            return f.Integer(name, primary_key=bool(flags & PRIMARY_KEY), nullable=nullable)
+        if code is TypeCode.VARCHAR:
+            return f.Varchar(name, self.sizes[i], primary_key=bool(flags & PRIMARY_KEY), nullable=nullable)
+        if code is TypeCode.FOREIGN_KEY:
+            return f.ForeignKeyField(
+                name,
+                type=names[self.fk_types[i]],
+                ref_table=names[self.ref_table_names[i]],
+                ref_operator=chr(self.ref_operators[i]),
+                ref_field=names[self.ref_field_names[i]],
+                nullable=nullable,
+            )
+        if code is TypeCode.ARRAY:
+            return f.Array(name, self.__subfield(i))
+        return FIELD_TYPES[code](name, nullable=nullable)
+
+    def __subfield(self, i: int) -> tp.Any:
+        flags = self.flags[i]
+        code = TypeCode(self.sub_types[i])
+        nullable = bool(flags & SUB_NULLABLE)
+        primary_key = bool(flags & SUB_PRIMARY_KEY)
+        if code is TypeCode.VARCHAR:
+            return f.Varchar(ARRAY_SUBFIELD_NAME, self.sizes[i], primary_key=primary_key, nullable=nullable)
+        if code is TypeCode.INTEGER:
+            return f.Integer(ARRAY_SUBFIELD_NAME, primary_key=primary_key, nullable=nullable)
+        return FIELD_TYPES[code](ARRAY_SUBFIELD_NAME, nullable=nullable)
+
+    def table(self, index: int) -> Table:
+        return Table(self.table_name(index), [self.field(i) for i in self.field_range(index)])
+
+    def tables(self) -> tp.Iterator[Table]:
+        for index in range(len(self)):
+            yield self.table(index)
+
+    # whole-schema queries, run as C-level scans over the columns
+
+    def fields_of_type(self, code: TypeCode) -> list[int]:
+        return list(itertools.compress(range(self.field_count), map(code.__eq__, self.type_codes)))
+
+    def foreign_keys_into(self, table_name: str) -> list[int]:
+        name_id = self.name_id(table_name)
+        if name_id == NO_NAME:
+            return []
+        return list(itertools.compress(range(self.field_count), map(name_id.__eq__, self.ref_table_names)))
+
+    def nullable_foreign_keys_into(self, table_name: str) -> list[int]:
+        flags = self.flags
+        return [i for i in self.foreign_keys_into(table_name) if flags[i] & NULLABLE]
+
+    def nullable_fields(self) -> list[int]:
+        return list(itertools.compress(range(self.field_count), map(operator.and_, self.flags, itertools.repeat(NULLABLE))))
+
+    def dangling_foreign_keys(self) -> list[int]:
+        """Foreign keys whose target table is not in the store."""
+        fks = self.fields_of_type(TypeCode.FOREIGN_KEY)
+        ref_tables = self.ref_tables
+        return [i for i in fks if ref_tables[i] == -1]
+
+    def qualified_name(self, field_index: int) -> str:
+        return f'{self.table_name(self.table_of(field_index))}.{self.names[self.field_names[field_index]]}'
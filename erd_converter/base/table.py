@@ -5,7 +5,7 @@ import dataclasses
 from .field import Field
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Table:
     name: str
     fields: list[Field] = dataclasses.field(default_factory=lambda: [])
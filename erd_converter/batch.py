@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import glob
+import hashlib
+import json
+import os
+import time
+import typing as tp
+from pathlib import Path
+
+from erd_converter.bytecode import compile_module
+from erd_converter.convert import render_block, sorted_texts
+from erd_converter.uml.index import scan_table_spans
+
+
+MANIFEST_NAME = 'manifest.json'
+
+
+@dataclasses.dataclass
+class BatchEntry:
+    input: str
+    output: str
+    input_sha256: str | None = None
+    output_sha256: str | None = None
+    tables: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+    bytecode: str | None = None
+
+
+def find_inputs(pattern: str | Path) -> list[Path]:
+    """DBML files in a directory (recursively) or matching a glob pattern, sorted."""
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(path.rglob('*.dbml'))
+    return sorted(Path(p) for p in glob.glob(str(pattern), recursive=True) if Path(p).is_file())
+
+
+def output_paths(inputs: tp.Sequence[Path], out_dir: Path) -> list[Path]:
+    """Mirror `inputs` under `out_dir` relative to their common directory."""
+    if not inputs:
+        return []
+    root = Path(os.path.commonpath([p.resolve().parent for p in inputs]))
+    return [out_dir / p.resolve().relative_to(root).with_suffix('.py') for p in inputs]
+
+
+def convert_one(input_path: Path, output_path: Path, bytecode: bool = False) -> BatchEntry:
+    """Convert one file, recording any failure in the entry so the rest of the batch goes on."""
+    started = time.perf_counter()
+    entry = BatchEntry(input=str(input_path), output=str(output_path))
+    try:
+        with open(input_path, 'rb') as f:
+            data = f.read()
+        entry.input_sha256 = hashlib.sha256(data).hexdigest()
+        blocks = [data[start:end] for _, start, end in scan_table_spans(data, strict=True)]
+        text = ''.join(sorted_texts(blocks, [render_block(block) for block in blocks]))
+        encoded = text.encode()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(encoded)
+        entry.output_sha256 = hashlib.sha256(encoded).hexdigest()
+        entry.tables = len(blocks)
+        if bytecode:
+            entry.bytecode = str(compile_module(output_path))
+    except Exception as e:
+        entry.error = str(e) if isinstance(e, ValueError) else f'{e.__class__.__name__}: {e}'
+    entry.seconds = time.perf_counter() - started
+    return entry
+
+
+def run_batch(inputs: tp.Sequence[Path], out_dir: Path, workers: int = 1, bytecode: bool = False) -> list[BatchEntry]:
+    """Convert every input into `out_dir` and write `manifest.json` next to the outputs.
+
+    All files share one process pool, so the interpreter starts once per
+    worker instead of once per file.
+    """
+    outputs = output_paths(inputs, out_dir)
+    started = time.perf_counter()
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            entries = list(executor.map(convert_one, inputs, outputs, [bytecode] * len(inputs)))
+    else:
+        entries = [convert_one(i, o, bytecode) for i, o in zip(inputs, outputs)]
+
+    manifest = {
+        'workers': workers,
+        'seconds': time.perf_counter() - started,
+        'files': [dataclasses.asdict(entry) for entry in entries],
+    }
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / MANIFEST_NAME, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return entries
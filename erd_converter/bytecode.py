@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import py_compile
+import typing as tp
+from pathlib import Path
+
+
+def compile_module(
+    path: Path,
+    root: Path | None = None,
+    optimize: int = -1,
+    invalidation_mode: py_compile.PycInvalidationMode = py_compile.PycInvalidationMode.CHECKED_HASH,
+) -> Path:
+    """Write the `__pycache__` bytecode of the module at `path` and return its path.
+
+    Hash-based invalidation keeps the `.pyc` valid wherever the source is
+    copied with any mtime, and the recorded file name is relative to
+    `root` (the file name alone by default) rather than the build
+    directory, so the same source always yields the same bytes and can be
+    baked into an image. `CHECKED_HASH` re-hashes the source on import;
+    `UNCHECKED_HASH` trusts the `.pyc` entirely.
+    """
+    path = Path(path)
+    display_name = path.relative_to(root) if root is not None else Path(path.name)
+    cfile = py_compile.compile(
+        str(path),
+        dfile=display_name.as_posix(),
+        doraise=True,
+        optimize=optimize,
+        invalidation_mode=invalidation_mode,
+    )
+    return Path(cfile)
+
+
+def compile_modules(paths: tp.Iterable[Path], root: Path | None = None, optimize: int = -1) -> list[Path]:
+    return [compile_module(path, root, optimize) for path in paths if Path(path).suffix == '.py']
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import typing as tp
+from pathlib import Path
+
+import erd_converter
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'erd_converter'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = '.py'
+# modules, relative to the package, whose code decides the source generated for a table
+RENDER_SOURCES = ('convert.py', 'base/*.py', 'uml/*.py', 'peewee/*.py')
+
+
+def sources_digest(root: Path, patterns: tp.Iterable[str] = RENDER_SOURCES) -> str:
+    """Hash of the names and contents of the files matching `patterns` under `root`."""
+    digest = hashlib.sha256()
+    for path in sorted({path for pattern in patterns for path in root.glob(pattern)}):
+        digest.update(path.relative_to(root).as_posix().encode() + b'\0')
+        digest.update(path.read_bytes() + b'\0')
+    return digest.hexdigest()
+
+
+@functools.cache
+def render_fingerprint() -> str:
+    """Package version and digest of the parsing and rendering code.
+
+    Any change to the generator changes it, so cached tables never outlive
+    the code that rendered them.
+    """
+    root = Path(erd_converter.__file__).parent
+    return f'{erd_converter.__version__}+{sources_digest(root)[:16]}'
+
+
+class TableCache:
+    """On-disk cache of rendered tables keyed by the hash of their raw DBML block.
+
+    The key also covers `render_fingerprint()` and `options`, so upgrading,
+    editing the generator or changing generation options never serves stale output. Entries are
+    evicted least-recently-used first (a hit bumps the entry's mtime) once
+    the cache grows over `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        options: tp.Mapping[str, tp.Any] | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        salt = {'version': render_fingerprint(), 'options': dict(options or {})}
+        self.__salt = json.dumps(salt, sort_keys=True).encode() + b'\0'
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> TableCache:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.evict()
+
+    def key(self, block: bytes) -> str:
+        return hashlib.sha256(self.__salt + block).hexdigest()
+
+    def __path(self, key: str) -> Path:
+        return self.directory / key[:2] / (key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> str | None:
+        path = self.__path(key)
+        try:
+            with open(path, 'r') as f:
+                text = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self.__path(key)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def get_or_render(self, block: bytes, render: tp.Callable[[bytes], str]) -> str:
+        key = self.key(block)
+        text = self.get(key)
+        if text is None:
+            text = render(block)
+            self.put(key, text)
+        return text
+
+    def __entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.__entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        entries = self.__entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for _, _, path in self.__entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
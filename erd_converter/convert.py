@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import concurrent.futures
+import mmap
+import typing as tp
+from pathlib import Path
+
+from erd_converter.base import binary
+from erd_converter.base.graph import Ordering, topological_order
+from erd_converter.base.table import Table
+from erd_converter.cache import TableCache
+from erd_converter.peewee import reader
+from erd_converter.peewee.table import PeeweeTable, ordered_tables, render_tables_to
+from erd_converter.sqlite import introspect
+from erd_converter.uml.index import scan_table_spans
+from erd_converter.uml.iterator import UMLIterator, table_lines
+from erd_converter.uml.lexer import parse_ref_option, tokenize_field
+from erd_converter.uml.table import UMLTable
+
+
+# Each worker gets several shards so a slow one does not hold up the pool.
+SHARDS_PER_WORKER = 4
+
+
+def render_table(table: UMLTable) -> str:
+    return str(PeeweeTable.from_table(table.to_table()))
+
+
+def forward_deferred_tables(tables: tp.Iterable[Table]) -> tp.Iterator[PeeweeTable]:
+    """Convert `tables` in file order, deferring foreign keys to models defined later.
+
+    Peewee resolves a `DeferredForeignKey` when the model it names is
+    created, so only forward references may be deferred: a key to an
+    earlier model would never be resolved.
+    """
+    defined: set[str] = set()
+    for table in tables:
+        defined.add(table.name)
+        yield PeeweeTable.from_table(table, defined=defined)
+
+
+def convert_tables_to(tables: tp.Iterable[Table], stream: tp.TextIO, sort: bool = False, defer_forward: bool = False) -> None:
+    """Render base `tables` as Peewee models into `stream`.
+
+    With `sort` models are emitted in foreign key dependency order (see
+    `ordered_tables`), which needs the whole schema in memory first. With
+    `defer_forward` file order is kept in a single pass and every key to a
+    model defined later is deferred (see `forward_deferred_tables`).
+    """
+    if defer_forward:
+        peewee_tables = forward_deferred_tables(tables)
+    elif sort:
+        peewee_tables = ordered_tables(list(tables))
+    else:
+        peewee_tables = (PeeweeTable.from_table(table) for table in tables)
+    render_tables_to(peewee_tables, stream)
+
+
+def read_tables(file: Path) -> list[Table]:
+    """Base tables of a DBML file, compiled schema, SQLite database or Peewee module."""
+    suffix = Path(file).suffix
+    if suffix == binary.SCHEMA_SUFFIX:
+        return list(binary.load(file).tables())
+    if suffix in introspect.SQLITE_SUFFIXES:
+        return introspect.read_file(file)
+    if suffix == '.py':
+        return reader.read_file(file)
+    with UMLIterator(file) as uml:
+        return [table.to_table() for table in uml]
+
+
+def convert_file_to(file: Path, stream: tp.TextIO, sort: bool = False, defer_forward: bool = False) -> None:
+    """Convert `file` writing the rendered models straight into `stream`.
+
+    `file` is DBML, a schema compiled with `binary.dump` or a SQLite database.
+    """
+    suffix = Path(file).suffix
+    if suffix == binary.SCHEMA_SUFFIX:
+        convert_tables_to(binary.load(file).tables(), stream, sort, defer_forward)
+        return
+    if suffix in introspect.SQLITE_SUFFIXES:
+        convert_tables_to(introspect.read_file(file), stream, sort, defer_forward)
+        return
+    with UMLIterator(file) as uml:
+        convert_tables_to((table.to_table() for table in uml), stream, sort, defer_forward)
+
+
+def render_block(block: bytes, deferred: tp.Collection[str] = ()) -> str:
+    table = UMLTable.from_str(table_lines(block.decode())).to_table()
+    return str(PeeweeTable.from_table(table, deferred))
+
+
+def iterate_blocks(buffer: tp.Any) -> tp.Iterator[bytes]:
+    """Raw table blocks of `buffer`, raising `ValueError` on malformed or unclosed tables."""
+    for _, start, end in scan_table_spans(buffer, strict=True):
+        yield buffer[start:end]
+
+
+def read_blocks(file: Path) -> list[bytes]:
+    """Raw table blocks of a DBML file, read and framed in one go."""
+    with open(file, 'rb') as f:
+        return list(iterate_blocks(f.read()))
+
+
+def convert_block(block: bytes, cache: TableCache | None = None, deferred: tp.Collection[str] = ()) -> str:
+    if cache is None:
+        return render_block(block, deferred)
+    if not deferred:
+        return cache.get_or_render(block, render_block)
+    # the same block renders differently once some of its foreign keys are deferred
+    key_block = block + b'\0deferred:' + ','.join(sorted(deferred)).encode()
+    return cache.get_or_render(key_block, lambda _: render_block(block, deferred))
+
+
+def convert_blocks(blocks: tp.Iterable[bytes], cache: TableCache | None = None) -> tp.Iterator[str]:
+    for block in blocks:
+        yield convert_block(block, cache)
+
+
+def block_references(block: bytes) -> tuple[str, list[tuple[str, str]]]:
+    """Table name and `(field, ref_table)` pairs of a raw block, without parsing other fields."""
+    header, _, body = block.decode().partition('{')
+    refs = []
+    for line in body.splitlines():
+        if 'ref' not in line or line.lstrip().startswith('//'):
+            continue
+        tokens = tokenize_field(line)
+        for option in tokens.options:
+            ref = parse_ref_option(option)
+            if ref is not None:
+                refs.append((tokens.name, ref[0]))
+                break
+    return header.split()[1], refs
+
+
+def order_blocks(blocks: tp.Sequence[bytes]) -> Ordering:
+    names = []
+    references = []
+    for block in blocks:
+        name, refs = block_references(block)
+        names.append(name)
+        references.append(refs)
+    return topological_order(names, references)
+
+
+def sorted_texts(blocks: tp.Sequence[bytes], texts: tp.Sequence[str], cache: TableCache | None = None) -> tp.Iterator[str]:
+    """Yield rendered `texts` of `blocks` in dependency order.
+
+    Only tables with a deferred foreign key are rendered again.
+    """
+    ordering = order_blocks(blocks)
+    for i in ordering.order:
+        deferred = ordering.deferred.get(i)
+        yield convert_block(blocks[i], cache, deferred) if deferred else texts[i]
+
+
+def iterate_tables_from_uml_file(file: Path, cache: TableCache | None = None, sort: bool = False) -> tp.Iterator[str]:
+    if cache is None and not sort:
+        with UMLIterator(file) as uml:
+            for table in uml:
+                yield render_table(table)
+        return
+    blocks = read_blocks(file)
+    if not sort:
+        yield from convert_blocks(blocks, cache)
+        return
+    yield from sorted_texts(blocks, list(convert_blocks(blocks, cache)), cache)
+
+
+def plan_shards(weights: tp.Sequence[int], count: int) -> list[tuple[int, int]]:
+    """Split `weights` into at most `count` contiguous `[start, stop)` runs of similar total weight."""
+    if not weights:
+        return []
+    target = sum(weights) / max(count, 1)
+    shards = []
+    start = 0
+    acc = 0
+    for i, weight in enumerate(weights):
+        # cut before an item whose midpoint falls past the next shard boundary
+        if i > start and acc + weight / 2 > target * (len(shards) + 1):
+            shards.append((start, i))
+            start = i
+        acc += weight
+    shards.append((start, len(weights)))
+    return shards
+
+
+def shard_byte_ranges(buffer: tp.Any, count: int) -> list[tuple[int, int]]:
+    """Byte ranges of `buffer` aligned to table blocks and balanced by field count."""
+    spans = scan_table_spans(buffer, strict=True)
+    # A block has one line per field plus the header and the closing brace.
+    weights = [max(buffer[start:end].count(b'\n') - 2, 1) for _, start, end in spans]
+    return [(spans[first][1], spans[last - 1][2]) for first, last in plan_shards(weights, count)]
+
+
+def convert_byte_range(file: Path, start: int, end: int, cache: TableCache | None = None) -> list[str]:
+    with open(file, 'rb') as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    return list(convert_blocks(iterate_blocks(chunk), cache))
+
+
+def iterate_tables_parallel(
+    file: Path,
+    workers: int,
+    cache: TableCache | None = None,
+    sort: bool = False,
+) -> tp.Iterator[str]:
+    """Convert `file` in a process pool, yielding rendered tables in file (or dependency) order."""
+    with open(file, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return
+        with buffer:
+            ranges = shard_byte_ranges(buffer, workers * SHARDS_PER_WORKER)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        starts, ends = zip(*ranges) if ranges else ((), ())
+        shards = executor.map(
+            convert_byte_range, [file] * len(ranges), starts, ends, [cache] * len(ranges),
+        )
+        if not sort:
+            for texts in shards:
+                yield from texts
+            return
+        texts = [text for shard in shards for text in shard]
+    with open(file, 'rb') as f:
+        blocks = list(iterate_blocks(f.read()))
+    yield from sorted_texts(blocks, texts, cache)
@@ -6,26 +6,59 @@ import typing as tp
 from typing_extensions import Self
 
 from erd_converter import base as bf
-from . import utils
+from . import reader, utils
 
 
 T = tp.TypeVar('T')
 
 
 class PeeweeField(bf.BaseField[T]):
+    __slots__ = ()
+
     name: str
     options: str
     field_type: tp.ClassVar[str]
+    declarations: tp.ClassVar[dict[tp.Hashable, str]]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.declarations = {}
 
     @classmethod
     def from_str(cls, line: str) -> Self:
-        raise NotImplementedError
+        """Read back a `name = SomeField(...)` declaration of this field class."""
+        field = reader.field_from_str(line)
+        if field.__class__ is not cls.model_type():
+            raise ValueError(f'Not a {cls.__name__} declaration: {line.strip()}')
+        return cls.from_field(field)
+
+    @property
+    def template_key(self) -> tp.Hashable:
+        """Attributes `options` depends on: fields with equal keys render alike."""
+        return self.nullable
+
+    def render_declaration(self) -> str:
+        return f' = {self.field_type}({self.options})'
+
+    @property
+    def declaration(self) -> str:
+        """The field source after its name, e.g. ` = CharField(null=True)`, cached per template key."""
+        key = self.template_key
+        try:
+            return self.declarations[key]
+        except KeyError:
+            declaration = self.declarations[key] = self.render_declaration()
+            return declaration
+
+    def render_to(self, stream: tp.TextIO) -> None:
+        stream.write(self.name)
+        stream.write(self.declaration)
 
     def __str__(self) -> str:
-        return f'{self.name} = {self.field_type}({self.options})'
+        return self.name + self.declaration
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeIntegerField(PeeweeField[bf.Integer]):
     name: str
     primary_key: bool = False
@@ -39,12 +72,16 @@ class PeeweeIntegerField(PeeweeField[bf.Integer]):
             options.append('null=True')
         return ', '.join(options)
 
-    def __str__(self) -> str:
+    @property
+    def template_key(self) -> tp.Hashable:
+        return self.primary_key, self.nullable
+
+    def render_declaration(self) -> str:
         field_type = 'AutoField' if self.primary_key else self.field_type
-        return f'{self.name} = {field_type}({self.options})'
+        return f' = {field_type}({self.options})'
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeFloatField(PeeweeField[bf.Float]):
     name: str
     primary_key: bool = False
@@ -59,7 +96,7 @@ class PeeweeFloatField(PeeweeField[bf.Float]):
         return ', '.join(options)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeVarcharField(PeeweeField[bf.Varchar]):
     name: str
     size: int
@@ -67,17 +104,23 @@ class PeeweeVarcharField(PeeweeField[bf.Varchar]):
     nullable: bool = False
     field_type: tp.ClassVar[str] = 'CharField'
 
+    @property
+    def template_key(self) -> tp.Hashable:
+        return self.size, self.primary_key, self.nullable
+
     @property
     def options(self) -> str:
         options = []
         if self.size != 256:
             options.append(f'max_length={self.size}')
+        if self.primary_key:
+            options.append('primary_key=True')
         if self.nullable:
             options.append('null=True')
         return ', '.join(options)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeBooleanField(PeeweeField[bf.Boolean]):
     name: str
     nullable: bool = False
@@ -91,7 +134,7 @@ class PeeweeBooleanField(PeeweeField[bf.Boolean]):
         return ', '.join(options)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeDateTimeField(PeeweeField[bf.DateTime]):
     name: str
     nullable: bool = False
@@ -105,7 +148,7 @@ class PeeweeDateTimeField(PeeweeField[bf.DateTime]):
         return ', '.join(options)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeForeignKeyField(PeeweeField[bf.ForeignKeyField]):
     name: str
     type: str
@@ -114,15 +157,38 @@ class PeeweeForeignKeyField(PeeweeField[bf.ForeignKeyField]):
     ref_field: str
     nullable: bool = False
     lazy_load: bool = False
+    # target is defined later in the module, resolve it by name
+    deferred: bool = False
+    # target is the model being defined
+    self_reference: bool = False
     field_type: tp.ClassVar[str] = 'ForeignKeyField'
+    deferred_field_type: tp.ClassVar[str] = 'DeferredForeignKey'
 
     @property
-    def options(self) -> str:
+    def template_key(self) -> tp.Hashable:
+        return self.ref_table, self.ref_field, self.nullable, self.lazy_load, self.deferred, self.self_reference
+
+    @property
+    def ref_model(self) -> str:
+        if self.self_reference:
+            return "'self'"
         ref_table = utils.get_peewee_table_class_name(self.ref_table)
-        return ', '.join((ref_table, f"field='{self.ref_field}'", f'lazy_load={self.lazy_load}'))
+        return f"'{ref_table}'" if self.deferred else ref_table
+
+    @property
+    def options(self) -> str:
+        options = [self.ref_model, f"field='{self.ref_field}'"]
+        if self.nullable:
+            options.append('null=True')
+        options.append(f'lazy_load={self.lazy_load}')
+        return ', '.join(options)
 
+    def render_declaration(self) -> str:
+        field_type = self.deferred_field_type if self.deferred and not self.self_reference else self.field_type
+        return f' = {field_type}({self.options})'
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(slots=True)
 class PeeweeArrayField(PeeweeField[bf.Array]):
     name: str
     subfield: PeeweeIntegerField | PeeweeVarcharField | PeeweeBooleanField
@@ -133,15 +199,22 @@ class PeeweeArrayField(PeeweeField[bf.Array]):
         bf.Boolean: PeeweeBooleanField,
     }
 
+    @property
+    def template_key(self) -> tp.Hashable:
+        return self.subfield.field_type, self.subfield.template_key
+
     @property
     def _options(self) -> str:
         return ''
 
     @property
     def field_kwargs(self) -> dict:
-        kw = {}
+        kw: dict[str, tp.Any] = {}
         if not self.subfield.nullable:
             kw['null'] = False
+        size = getattr(self.subfield, 'size', 256)
+        if size != 256:
+            kw['max_length'] = size
         return kw
 
     @property
@@ -168,7 +241,7 @@ class PeeweeArrayField(PeeweeField[bf.Array]):
         return cls(name=field.name, subfield=subfield)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeJsonField(PeeweeField[bf.Json]):
     name: str
     nullable: bool = False
@@ -183,7 +256,7 @@ class PeeweeJsonField(PeeweeField[bf.Json]):
         return ', '.join(options)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeBytesField(PeeweeField[bf.Bytes]):
     name: str
     nullable: bool = False
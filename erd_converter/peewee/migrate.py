@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import typing as tp
+
+from erd_converter import base as bf
+from erd_converter.base.diff import FieldChange, SchemaDiff
+from . import utils
+from .table import PeeweeTable
+
+
+HEADER = '''from peewee import *
+from playhouse.migrate import SchemaMigrator, migrate
+
+from {models_module} import *
+
+
+def forward(database):
+    migrator = SchemaMigrator.from_database(database)
+'''
+
+
+def quote_identifier(name: str) -> str:
+    """SQL-standard quoting (PostgreSQL, SQLite) of a table or column name."""
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def field_expression(field: tp.Any) -> str:
+    """Peewee constructor call for a base field, e.g. `CharField(null=True)`."""
+    # an anonymous table: a reference to the owner is spelled with its class name, not 'self'
+    (peewee_field,) = PeeweeTable.from_table(bf.Table('', [field])).fields
+    return peewee_field.declaration.removeprefix(' = ')
+
+
+def change_operations(table: str, change: FieldChange) -> list[str]:
+    name = change.name
+    if change.only_nullable:
+        operation = 'drop_not_null' if change.new.nullable else 'add_not_null'
+        return [f'migrator.{operation}({table!r}, {name!r})']
+    return [f'migrator.alter_column_type({table!r}, {name!r}, {field_expression(change.new)})']
+
+
+def migration_operations(diff: SchemaDiff) -> list[str]:
+    """`playhouse.migrate` operations for the column changes of `diff`."""
+    operations = []
+    for change in diff.changed:
+        table = change.name
+        operations.extend(f'migrator.drop_column({table!r}, {field.name!r})' for field in change.removed)
+        for field_change in change.changed:
+            operations.extend(change_operations(table, field_change))
+        operations.extend(
+            f'migrator.add_column({table!r}, {field.name!r}, {field_expression(field)})' for field in change.added
+        )
+    return operations
+
+
+def render_migration(diff: SchemaDiff, models_module: str = 'models') -> str:
+    """A migration module with a `forward(database)` function applying `diff`.
+
+    New tables are created from the regenerated models imported from
+    `models_module`, columns are changed with `playhouse.migrate`, and
+    removed tables are dropped last.
+    """
+    lines = [HEADER.format(models_module=models_module)]
+    if diff.added:
+        models = ', '.join(utils.get_peewee_table_class_name(table.name) for table in diff.added)
+        lines.append(f'    database.create_tables([{models}])\n')
+    operations = migration_operations(diff)
+    if operations:
+        lines.append('    migrate(\n')
+        lines.extend(f'        {operation},\n' for operation in operations)
+        lines.append('    )\n')
+    for table in diff.removed:
+        lines.append(f'    database.execute_sql({f"DROP TABLE IF EXISTS {quote_identifier(table.name)}"!r})\n')
+    if not diff:
+        lines.append('    pass\n')
+    return ''.join(lines)
+
+
+def render_affected(diff: SchemaDiff, tables: tp.Iterable[bf.Table]) -> tp.Iterator[str]:
+    """Render only the models of `tables` (the new schema) that `diff` added or changed."""
+    affected = diff.affected
+    for table in tables:
+        if table.name in affected:
+            yield str(PeeweeTable.from_table(table))
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import io
+import os
+import typing as tp
+from pathlib import Path
+
+from erd_converter import base as bf
+from erd_converter.base.graph import SchemaIndex
+from . import field as peewee_field
+from . import utils
+from .table import PeeweeTable, render_tables_to
+
+
+DEFAULT_TABLES_PER_MODULE = 100
+BASE_MODULE = 'base'
+BASE_SOURCE = '''# Shared by every generated module, edit freely: it is not overwritten.
+import functools
+import json
+
+from peewee import *
+from playhouse.postgres_ext import *
+
+
+class BaseModel(Model):
+    pass
+'''
+MODULE_HEADER = 'from .{base} import *\n'
+INIT_SOURCE = '''import importlib
+
+# model name -> module defining it; modules are imported on first access
+_MODELS = {models}
+
+__all__ = list(_MODELS)
+
+
+def __getattr__(name):
+    try:
+        module = _MODELS[name]
+    except KeyError:
+        raise AttributeError(f'module {{__name__!r}} has no attribute {{name!r}}') from None
+    value = globals()[name] = getattr(importlib.import_module(f'.{{module}}', __name__), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODELS))
+'''
+
+
+@dataclasses.dataclass
+class Shard:
+    module: str
+    tables: list[PeeweeTable] = dataclasses.field(default_factory=lambda: [])
+    # earlier modules whose models are referenced directly
+    imports: dict[str, list[str]] = dataclasses.field(default_factory=lambda: collections.defaultdict(list))
+    # later modules to import once this one is defined, resolving its deferred keys
+    resolves: set[str] = dataclasses.field(default_factory=set)
+
+
+def module_name(index: int, count: int) -> str:
+    return f'models_{index:0{max(len(str(count - 1)), 3)}d}'
+
+
+def plan_shards(tables: tp.Sequence[bf.Table], tables_per_module: int = DEFAULT_TABLES_PER_MODULE) -> list[Shard]:
+    """Split `tables` into modules of consecutive tables in dependency order.
+
+    A foreign key to a model of an earlier module is imported from it; one
+    closing a cycle is deferred and the module defining its target is
+    imported at the end of the module (when all its models exist), so
+    every `DeferredForeignKey` is resolved once any model using it is.
+    """
+    ordering = SchemaIndex(tables).ordering()
+    count = max(-(-len(tables) // tables_per_module), 1)
+    shards = [Shard(module_name(i, count)) for i in range(count)]
+    module_of: dict[str, int] = {}
+    for position, i in enumerate(ordering.order):
+        shard_index = position // tables_per_module
+        module_of[tables[i].name] = shard_index
+        shards[shard_index].tables.append(PeeweeTable.from_table(tables[i], ordering.deferred.get(i, ())))
+
+    for shard_index, shard in enumerate(shards):
+        for table in shard.tables:
+            for field in table.fields:
+                if not isinstance(field, peewee_field.PeeweeForeignKeyField) or field.self_reference:
+                    continue
+                target = module_of.get(field.ref_table)
+                if target is None or target == shard_index:
+                    continue
+                if field.deferred:
+                    shard.resolves.add(shards[target].module)
+                else:
+                    class_name = utils.get_peewee_table_class_name(field.ref_table)
+                    names = shard.imports[shards[target].module]
+                    if class_name not in names:
+                        names.append(class_name)
+    return shards
+
+
+def render_shard(shard: Shard, base_module: str = BASE_MODULE) -> str:
+    stream = io.StringIO()
+    stream.write(MODULE_HEADER.format(base=base_module))
+    for module, names in sorted(shard.imports.items()):
+        stream.write(f'from .{module} import {", ".join(names)}\n')
+    render_tables_to(shard.tables, stream)
+    for module in sorted(shard.resolves):
+        stream.write(f'from . import {module}  # noqa: E402, resolves deferred foreign keys\n')
+    return stream.getvalue()
+
+
+def render_init(shards: tp.Sequence[Shard]) -> str:
+    models = '{\n' + ''.join(
+        f'    {utils.get_peewee_table_class_name(table.name)!r}: {shard.module!r},\n'
+        for shard in shards
+        for table in shard.tables
+    ) + '}'
+    return INIT_SOURCE.format(models=models)
+
+
+def _write(path: Path, source: str) -> None:
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(source)
+    os.replace(tmp_path, path)
+
+
+def write_package(
+    tables: tp.Sequence[bf.Table],
+    directory: Path,
+    tables_per_module: int = DEFAULT_TABLES_PER_MODULE,
+    base_module: str = BASE_MODULE,
+) -> list[Path]:
+    """Write the models of `tables` as a package whose `__init__` loads modules lazily.
+
+    `from package import User` imports only the module defining `User`
+    (and those it references), not every model. `base_module` holds the
+    imports and `BaseModel` shared by all modules; a default one is
+    written only if it does not exist yet. Stale `models_*` modules of a
+    previous, larger run are removed.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    shards = plan_shards(tables, tables_per_module)
+    written = []
+    base_path = directory / f'{base_module}.py'
+    if not base_path.exists():
+        _write(base_path, BASE_SOURCE)
+        written.append(base_path)
+    for shard in shards:
+        path = directory / f'{shard.module}.py'
+        _write(path, render_shard(shard, base_module))
+        written.append(path)
+    init_path = directory / '__init__.py'
+    _write(init_path, render_init(shards))
+    written.append(init_path)
+
+    current = {shard.module for shard in shards}
+    for stale in directory.glob('models_*.py'):
+        if stale.stem not in current:
+            stale.unlink()
+    return written
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import ast
+import contextlib
+import dataclasses
+import gc
+import sys
+import typing as tp
+from pathlib import Path
+
+from erd_converter import base as bf
+from erd_converter.base.field import ARRAY_SUBFIELD_NAME
+
+
+DEFAULT_VARCHAR_SIZE = 256
+DEFAULT_FK_TYPE = 'int'
+DEFAULT_REF_OPERATOR = '>'
+DEFAULT_REF_FIELD = 'id'
+SELF_REFERENCE = 'self'
+
+
+class PeeweeSyntaxError(ValueError):
+    def __init__(self, message: str, filename: str, lineno: int, col_offset: int = 0) -> None:
+        super().__init__(f'{filename}:{lineno}:{col_offset + 1}: {message}')
+        self.message = message
+        self.filename = filename
+        self.lineno = lineno
+        self.column = col_offset + 1
+
+
+@dataclasses.dataclass(slots=True)
+class _Call:
+    """A field constructor call with its literal arguments evaluated."""
+    type: str
+    args: list[tp.Any]
+    kwargs: dict[str, tp.Any]
+    node: ast.Call
+
+
+@dataclasses.dataclass(slots=True)
+class _Reference:
+    """A foreign key whose target model is resolved once the whole module was read."""
+    name: str
+    model: str
+    ref_field: str
+    nullable: bool
+
+
+def _name(node: ast.expr) -> str | None:
+    """`Name` of `Name` or `module.Name` nodes."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _literal(node: ast.expr) -> tp.Any:
+    """Constants and containers as values, model or field classes by their name.
+
+    A name is only meaningful where a class is expected, readers of other
+    arguments check the type they get (see `_flag` and `_varchar`).
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, (ast.Name, ast.Attribute)):
+        return _name(node)
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def _call(node: ast.expr) -> _Call | None:
+    if not isinstance(node, ast.Call):
+        return None
+    field_type = _name(node.func)
+    if field_type is None:
+        return None
+    return _Call(
+        type=field_type,
+        args=[_literal(arg) for arg in node.args],
+        kwargs={kw.arg: _literal(kw.value) for kw in node.keywords if kw.arg is not None},
+        node=node,
+    )
+
+
+def _flag(call: _Call, key: str) -> bool:
+    value = call.kwargs.get(key, False)
+    if not isinstance(value, bool):
+        raise ValueError(f'Cannot resolve `{key}` of `{call.type}`, expected True or False')
+    return value
+
+
+def _nullable(call: _Call) -> bool:
+    return _flag(call, 'null')
+
+
+def _integer(name: str, call: _Call) -> bf.Integer:
+    return bf.Integer(name, primary_key=_flag(call, 'primary_key'), nullable=_nullable(call))
+
+
+def _auto(name: str, call: _Call) -> bf.Integer:
+    return bf.Integer(name, primary_key=True, nullable=_nullable(call))
+
+
+def _varchar(name: str, call: _Call) -> bf.Varchar:
+    size = call.kwargs.get('max_length', DEFAULT_VARCHAR_SIZE)
+    if not isinstance(size, int) or isinstance(size, bool):
+        raise ValueError(f'Cannot resolve the max_length of `{name}`, expected an integer literal')
+    return bf.Varchar(name, size=size, primary_key=_flag(call, 'primary_key'), nullable=_nullable(call))
+
+
+def _text(name: str, call: _Call) -> bf.Varchar:
+    """Unbounded text columns, read as the default varchar like SQLite's TEXT."""
+    return bf.Varchar(name, size=DEFAULT_VARCHAR_SIZE, primary_key=_flag(call, 'primary_key'), nullable=_nullable(call))
+
+
+def _simple(field_cls: type) -> tp.Callable[[str, _Call], tp.Any]:
+    def read(name: str, call: _Call) -> tp.Any:
+        return field_cls(name, nullable=_nullable(call))
+    return read
+
+
+def _array(name: str, call: _Call) -> bf.Array:
+    subtype = call.args[0] if call.args else call.kwargs.get('field_class')
+    try:
+        read = SUBFIELD_READERS[subtype]
+    except KeyError:
+        raise ValueError(f'Unsupported array field type `{subtype}`') from None
+    # the generator only spells out `null=False`, a bare ArrayField holds nullable items
+    kwargs = dict(call.kwargs.get('field_kwargs') or {})
+    kwargs.setdefault('null', True)
+    subcall = _Call(type=subtype, args=[], kwargs=kwargs, node=call.node)
+    return bf.Array(name, read(ARRAY_SUBFIELD_NAME, subcall))
+
+
+def _foreign_key(name: str, call: _Call) -> _Reference:
+    model = call.args[0] if call.args else call.kwargs.get('model')
+    if not isinstance(model, str):
+        raise ValueError(f'Cannot resolve the model of foreign key `{name}`')
+    ref_field = call.kwargs.get('field', DEFAULT_REF_FIELD)
+    if not isinstance(ref_field, str):
+        raise ValueError(f'Cannot resolve the referenced field of foreign key `{name}`')
+    return _Reference(
+        name=name,
+        model=model,
+        ref_field=sys.intern(ref_field),
+        nullable=_nullable(call),
+    )
+
+
+FIELD_READERS: dict[str, tp.Callable[[str, _Call], tp.Any]] = {
+    'IntegerField': _integer,
+    'BigIntegerField': _integer,
+    'SmallIntegerField': _integer,
+    'AutoField': _auto,
+    'BigAutoField': _auto,
+    'CharField': _varchar,
+    'FixedCharField': _varchar,
+    'TextField': _text,
+    'UUIDField': _text,
+    'FloatField': _simple(bf.Float),
+    'DoubleField': _simple(bf.Float),
+    'DecimalField': _simple(bf.Float),
+    'BooleanField': _simple(bf.Boolean),
+    'DateTimeField': _simple(bf.DateTime),
+    'DateField': _simple(bf.DateTime),
+    'TimeField': _simple(bf.DateTime),
+    'TimestampField': _simple(bf.DateTime),
+    'BlobField': _simple(bf.Bytes),
+    'JSONField': _simple(bf.Json),
+    'BinaryJSONField': _simple(bf.Json),
+    'ArrayField': _array,
+    'ForeignKeyField': _foreign_key,
+    'DeferredForeignKey': _foreign_key,
+}
+SUBFIELD_READERS: dict[str, tp.Callable[[str, _Call], tp.Any]] = {
+    'IntegerField': _integer,
+    'CharField': _varchar,
+    'BooleanField': _simple(bf.Boolean),
+}
+
+
+def default_table_name(class_name: str) -> str:
+    """Peewee's table name for a model without `Meta.db_table`."""
+    return class_name.lower()
+
+
+def read_field(name: str, value: ast.expr, filename: str = '<string>') -> tp.Any | None:
+    """Base field (or pending `_Reference`) declared by `name = value`, None if it is not a field."""
+    call = _call(value)
+    if call is None or not call.type.endswith(('Field', 'ForeignKey')):
+        return None
+    try:
+        read = FIELD_READERS[call.type]
+    except KeyError:
+        raise PeeweeSyntaxError(f'Unsupported field type `{call.type}`', filename, value.lineno, value.col_offset) from None
+    try:
+        return read(name, call)
+    except (ValueError, IndexError, TypeError) as e:
+        raise PeeweeSyntaxError(str(e), filename, value.lineno, value.col_offset) from None
+
+
+def _meta_table_name(node: ast.ClassDef) -> str | None:
+    for statement in node.body:
+        if isinstance(statement, ast.Assign) and any(_name(target) in ('db_table', 'table_name') for target in statement.targets):
+            value = _literal(statement.value)
+            if isinstance(value, str):
+                # identifiers are interned by the parser, string constants are not
+                return sys.intern(value)
+    return None
+
+
+def read_model(node: ast.ClassDef, filename: str = '<string>') -> tuple[str | None, list[tp.Any]]:
+    """Table name from `Meta` (if any) and fields of a model class body."""
+    table_name = None
+    fields = []
+    for statement in node.body:
+        if isinstance(statement, ast.ClassDef) and statement.name == 'Meta':
+            table_name = _meta_table_name(statement)
+        elif isinstance(statement, ast.Assign) and len(statement.targets) == 1 and isinstance(statement.targets[0], ast.Name):
+            field = read_field(statement.targets[0].id, statement.value, filename)
+            if field is not None:
+                fields.append(field)
+    return table_name, fields
+
+
+def read_tree(tree: ast.Module, filename: str = '<string>') -> list[bf.Table]:
+    """Tables of every model class at the top level of `tree`.
+
+    Classes without fields and without `Meta.db_table` (such as a
+    `BaseModel` holding the database) are skipped. Foreign keys are
+    resolved to table names after the walk, so models may reference
+    classes defined later.
+    """
+    models: list[tuple[str, list[tp.Any]]] = []
+    table_names: dict[str, str] = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        table_name, fields = read_model(node, filename)
+        if table_name is None and not fields:
+            continue
+        table_name = table_name or default_table_name(node.name)
+        table_names[node.name] = table_name
+        models.append((table_name, fields))
+
+    return [
+        bf.Table(table_name, [_resolve(field, table_name, table_names) for field in fields])
+        for table_name, fields in models
+    ]
+
+
+def _resolve(field: tp.Any, table_name: str | None, table_names: tp.Mapping[str, str]) -> tp.Any:
+    if not isinstance(field, _Reference):
+        return field
+    if field.model == SELF_REFERENCE:
+        if table_name is None:
+            raise ValueError(f'Foreign key `{field.name}` references `self` outside a model')
+        ref_table = table_name
+    else:
+        ref_table = table_names.get(field.model) or default_table_name(field.model)
+    return bf.ForeignKeyField(
+        field.name,
+        type=DEFAULT_FK_TYPE,
+        ref_table=ref_table,
+        ref_operator=DEFAULT_REF_OPERATOR,
+        ref_field=field.ref_field,
+        nullable=field.nullable,
+    )
+
+
+@contextlib.contextmanager
+def gc_paused() -> tp.Iterator[None]:
+    """Pause the process-wide garbage collector, e.g. around `read_file`.
+
+    A large module yields millions of AST nodes, none of them garbage, and
+    the collections their allocation triggers would take longer than the
+    parse and the walk together. This affects every thread, so the library
+    leaves it to applications (such as the CLI) that own the process.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def read_source(source: str | bytes, filename: str = '<string>') -> list[bf.Table]:
+    """Parse Peewee model source without importing (or executing) it."""
+    return read_tree(ast.parse(source, filename), filename)
+
+
+def read_file(filepath: Path) -> list[bf.Table]:
+    with open(filepath, 'rb') as f:
+        return read_source(f.read(), str(filepath))
+
+
+def field_from_str(line: str) -> tp.Any:
+    """Base field declared by a single `name = SomeField(...)` line.
+
+    Foreign keys point to the default table name of their model.
+    """
+    try:
+        statement = ast.parse(line.strip()).body[0]
+    except (SyntaxError, IndexError):
+        raise ValueError(f'Invalid line {line}') from None
+    if not isinstance(statement, ast.Assign) or len(statement.targets) != 1 or not isinstance(statement.targets[0], ast.Name):
+        raise ValueError(f'Invalid line {line}')
+    field = read_field(statement.targets[0].id, statement.value)
+    if field is None:
+        raise ValueError(f'Not a field declaration: {line}')
+    return _resolve(field, None, {})
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import typing as tp
+
+
+class FragmentSink:
+    """Buffer many small `write` calls and pass them on to `stream` in large chunks.
+
+    `write` is a bound `list.append`, so a fragment costs one C call; call
+    `flush_if_full` between tables and `flush` at the end.
+    """
+
+    def __init__(self, stream: tp.TextIO, max_fragments: int = 1 << 14) -> None:
+        self.stream = stream
+        self.max_fragments = max_fragments
+        self.__fragments: list[str] = []
+        self.write = self.__fragments.append
+
+    def flush_if_full(self) -> None:
+        if len(self.__fragments) >= self.max_fragments:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.__fragments:
+            self.stream.write(''.join(self.__fragments))
+            self.__fragments.clear()
+
+    def __enter__(self) -> FragmentSink:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import dataclasses
+import io
 import typing as tp
 
+from typing_extensions import Self
+
 from erd_converter import base as bf
+from erd_converter.base.graph import SchemaIndex
 from . import field as peewee_field
 from . import utils
+from .sink import FragmentSink
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PeeweeTable(bf.BaseTable):
     name: str
     fields: list[peewee_field.PeeweeField] = dataclasses.field(default_factory=lambda: [])
@@ -24,12 +29,54 @@ class PeeweeTable(bf.BaseTable):
         bf.Bytes: peewee_field.PeeweeBytesField,
     }
 
-    def __str__(self) -> str:
-        table_name = utils.get_peewee_table_class_name(self.name)
-        res = f'\nclass {table_name}(BaseModel):\n'
+    @classmethod
+    def from_table(
+        cls,
+        table: bf.Table,
+        deferred: tp.Collection[str] = (),
+        defined: tp.Container[str] | None = None,
+    ) -> Self:
+        """Convert `table`; foreign keys named in `deferred` point to models defined later.
+
+        With `defined` (the tables whose models precede this one) every
+        foreign key to a table not in it is deferred as well.
+        """
+        peewee_table = super(PeeweeTable, cls).from_table(table)
+        for field in peewee_table.fields:
+            if isinstance(field, peewee_field.PeeweeForeignKeyField):
+                if field.ref_table == table.name:
+                    field.self_reference = True
+                elif field.name in deferred or (defined is not None and field.ref_table not in defined):
+                    field.deferred = True
+        return peewee_table
+
+    def render_to(self, stream: tp.TextIO) -> None:
+        """Write the model class source to `stream` fragment by fragment."""
+        write = stream.write
+        write('\nclass ')
+        write(utils.get_peewee_table_class_name(self.name))
+        write('(BaseModel):\n')
         for field in self.fields:
-            res += f'    {field}\n'
-        res += '\n'
-        res += '    class Meta:\n'
-        res += f"        db_table = '{self.name}'\n\n"
-        return res
+            write(f'    {field.name}{field.declaration}\n')
+        write("\n    class Meta:\n        db_table = '")
+        write(self.name)
+        write("'\n\n")
+
+    def __str__(self) -> str:
+        stream = io.StringIO()
+        self.render_to(stream)
+        return stream.getvalue()
+
+
+def render_tables_to(tables: tp.Iterable[PeeweeTable], stream: tp.TextIO) -> None:
+    """Render `tables` into `stream` through a `FragmentSink`."""
+    with FragmentSink(stream) as sink:
+        for table in tables:
+            table.render_to(sink)
+            sink.flush_if_full()
+
+
+def ordered_tables(tables: tp.Sequence[bf.Table]) -> list[PeeweeTable]:
+    """Convert `tables` in dependency order, deferring foreign keys that close a cycle."""
+    ordering = SchemaIndex(tables).ordering()
+    return [PeeweeTable.from_table(tables[i], ordering.deferred.get(i, ())) for i in ordering.order]
@@ -1,3 +1,7 @@
+import functools
 
+
+# a table's class name is spelled once per model and once per foreign key to it
+@functools.cache
 def get_peewee_table_class_name(table_name: str) -> str:
     return table_name.title().replace('_', '')
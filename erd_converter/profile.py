@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import functools
+import json
+import time
+import typing as tp
+from pathlib import Path
+
+from erd_converter import convert
+from erd_converter.base.base_table import BaseTable
+from erd_converter.cache import TableCache
+from erd_converter.peewee.sink import FragmentSink
+from erd_converter.peewee.table import PeeweeTable
+from erd_converter.uml import field as uml_field
+from erd_converter.uml.iterator import UMLIterator
+
+
+Hook = tp.Callable[[str, float, tp.Optional[str]], None]
+"""Called as `hook(stage, seconds, label)` after every instrumented call; `label` is e.g. a field type."""
+
+
+@dataclasses.dataclass(slots=True)
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    by_type: dict[str, StageStats] = dataclasses.field(default_factory=dict)
+
+    def add(self, seconds: float, label: str | None = None) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        if label is not None:
+            try:
+                stats = self.by_type[label]
+            except KeyError:
+                stats = self.by_type[label] = StageStats()
+            stats.calls += 1
+            stats.seconds += seconds
+
+    def as_dict(self) -> dict[str, tp.Any]:
+        result: dict[str, tp.Any] = {'calls': self.calls, 'seconds': self.seconds}
+        if self.by_type:
+            result['by_type'] = {label: stats.as_dict() for label, stats in sorted(self.by_type.items())}
+        return result
+
+
+class Profiler:
+    """Cumulative time and call counts of the conversion stages.
+
+    Nothing is instrumented until the profiler is installed (`with
+    Profiler() as profiler:` or `install`): only then are the stage
+    functions replaced by timing wrappers, and `uninstall` puts the
+    originals back, so a disabled profiler costs nothing.
+
+    Stages: `read` (`UMLIterator.__next__`, or `read_blocks` on the
+    cached path), `frame` (`scan_table_spans` in `convert`), `cache`
+    (`TableCache.get`, labelled `hit` or `miss`), `parse_field`
+    (`create_uml_field`), `from_tokens` (per UML field type), `to_table`,
+    `from_table`, `render` (`PeeweeTable.render_to`) and `write`
+    (`FragmentSink.flush`); callers may time their own with `stage`.
+    Work done in worker processes (`--workers`) is not recorded.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self.hooks: list[Hook] = []
+        self.__patches: list[tuple[tp.Any, str, tp.Any]] = []
+
+    def subscribe(self, hook: Hook) -> None:
+        self.hooks.append(hook)
+
+    def unsubscribe(self, hook: Hook) -> None:
+        self.hooks.remove(hook)
+
+    def record(self, stage: str, seconds: float, label: str | None = None) -> None:
+        try:
+            stats = self.stages[stage]
+        except KeyError:
+            stats = self.stages[stage] = StageStats()
+        stats.add(seconds, label)
+        for hook in self.hooks:
+            hook(stage, seconds, label)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, label: str | None = None) -> tp.Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, label)
+
+    def report(self) -> dict[str, tp.Any]:
+        return {'stages': {name: stats.as_dict() for name, stats in self.stages.items()}}
+
+    def dump(self, path: str | Path) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    # instrumentation
+
+    @property
+    def installed(self) -> bool:
+        return bool(self.__patches)
+
+    def install(self) -> None:
+        global _active
+        if _active is not None:
+            raise RuntimeError('Another profiler is already installed')
+        _active = self
+        self.__patch(UMLIterator, '__next__', self.__timed('read'))
+        self.__patch(convert, 'read_blocks', self.__timed('read'))
+        self.__patch(convert, 'scan_table_spans', self.__timed('frame'))
+        self.__patch(TableCache, 'get', self.__timed('cache', label_of=_cache_outcome))
+        self.__patch(uml_field, 'create_uml_field', self.__timed('parse_field', label_of=_class_name))
+        for cls in set(uml_field.DATA_TYPES.values()):
+            self.__patch_classmethod(cls, 'from_tokens', self.__timed('from_tokens', label=cls.__name__))
+        self.__patch(BaseTable, 'to_table', self.__timed('to_table'))
+        self.__patch_classmethod(BaseTable, 'from_table', self.__timed('from_table'))
+        self.__patch(PeeweeTable, 'render_to', self.__timed('render'))
+        self.__patch(FragmentSink, 'flush', self.__timed('write'))
+
+    def uninstall(self) -> None:
+        global _active
+        for owner, name, original in reversed(self.__patches):
+            if original is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self.__patches.clear()
+        if _active is self:
+            _active = None
+
+    def __enter__(self) -> Profiler:
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.uninstall()
+
+    def __timed(
+        self,
+        stage: str,
+        label: str | None = None,
+        label_of: tp.Callable[[tp.Any], str | None] | None = None,
+    ) -> tp.Callable:
+        record = self.record
+        perf_counter = time.perf_counter
+
+        def decorate(func: tp.Callable) -> tp.Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = perf_counter()
+                result = _MISSING
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                finally:
+                    record(stage, perf_counter() - started, label_of(result) if label_of is not None and result is not _MISSING else label)
+            return wrapper
+        return decorate
+
+    def __patch(self, owner: tp.Any, name: str, decorate: tp.Callable) -> None:
+        original = owner.__dict__.get(name, _MISSING) if isinstance(owner, type) else getattr(owner, name)
+        self.__patches.append((owner, name, original))
+        setattr(owner, name, decorate(getattr(owner, name)))
+
+    def __patch_classmethod(self, owner: type, name: str, decorate: tp.Callable) -> None:
+        original = owner.__dict__.get(name, _MISSING)
+        self.__patches.append((owner, name, original))
+        setattr(owner, name, classmethod(decorate(getattr(owner, name).__func__)))
+
+
+_MISSING = object()
+
+
+def _class_name(result: tp.Any) -> str:
+    return result.__class__.__name__
+
+
+def _cache_outcome(text: str | None) -> str:
+    return 'miss' if text is None else 'hit'
+_active: Profiler | None = None
+
+
+def active_profiler() -> Profiler | None:
+    return _active
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import sys
+import typing as tp
+from pathlib import Path
+
+from erd_converter import base as bf
+
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+DEFAULT_VARCHAR_SIZE = 256
+DEFAULT_REF_OPERATOR = '>'
+
+# `sqlite_master` is `sqlite_schema` under its name older than SQLite 3.33
+COLUMNS_QUERY = '''
+SELECT m.name, c.name, c.type, c."notnull", c.pk
+FROM sqlite_master AS m
+JOIN pragma_table_info(m.name) AS c
+WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+ORDER BY m.rowid, c.cid
+'''
+FOREIGN_KEYS_QUERY = '''
+SELECT m.name, k."from", k."table", k."to"
+FROM sqlite_master AS m
+JOIN pragma_foreign_key_list(m.name) AS k
+WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+'''
+
+SIZE_PATTERN = re.compile(r'\((\d+)')
+# NUMERIC affinity names: SQLite stores text as is in them unless it looks like a number
+TEXT_LIKE_TYPES = ('UUID', 'GUID', 'UNIQUEIDENTIFIER', 'STRING', 'ENUM', 'CITEXT', 'INET', 'CIDR')
+DECIMAL_TYPES = ('NUMERIC', 'DECIMAL', 'NUMBER', 'MONEY')
+
+
+def type_affinity(declared_type: str) -> str:
+    """SQLite's affinity of a declared column type, any name being valid."""
+    upper = declared_type.upper()
+    if 'INT' in upper:
+        return 'INTEGER'
+    if 'CHAR' in upper or 'CLOB' in upper or 'TEXT' in upper:
+        return 'TEXT'
+    if 'BLOB' in upper or not upper:
+        return 'BLOB'
+    if 'REAL' in upper or 'FLOA' in upper or 'DOUB' in upper:
+        return 'REAL'
+    return 'NUMERIC'
+
+
+def read_field(name: str, declared_type: str, not_null: bool, primary_key: bool) -> tp.Any:
+    """Base field for a column by its type affinity.
+
+    Types of NUMERIC affinity are mapped by name: JSON, booleans, dates,
+    decimals and text-like types (`UUID`, `STRING`...); any other raises
+    `ValueError` rather than guessing.
+    """
+    upper = declared_type.upper()
+    nullable = not not_null and not primary_key
+    affinity = type_affinity(upper)
+    if affinity == 'INTEGER':
+        return bf.Integer(name, primary_key=primary_key, nullable=nullable)
+    if affinity == 'TEXT' or any(text_type in upper for text_type in TEXT_LIKE_TYPES):
+        match = SIZE_PATTERN.search(upper)
+        size = int(match.group(1)) if match else DEFAULT_VARCHAR_SIZE
+        return bf.Varchar(name, size, primary_key=primary_key, nullable=nullable)
+    if affinity == 'BLOB':
+        return bf.Bytes(name, nullable=nullable)
+    if affinity == 'REAL':
+        return bf.Float(name, nullable=nullable)
+    if 'JSON' in upper:
+        return bf.Json(name, nullable=nullable)
+    if 'BOOL' in upper:
+        return bf.Boolean(name, nullable=nullable)
+    if 'DATE' in upper or 'TIME' in upper:
+        return bf.DateTime(name, nullable=nullable)
+    if any(decimal_type in upper for decimal_type in DECIMAL_TYPES):
+        return bf.Float(name, nullable=nullable)
+    raise ValueError(f'Unsupported column type `{declared_type}` of `{name}`')
+
+
+def _field_type(declared_type: str) -> str:
+    return 'int' if type_affinity(declared_type) == 'INTEGER' else declared_type.lower()
+
+
+def read_tables(connection: sqlite3.Connection) -> list[bf.Table]:
+    """Tables of the database behind `connection`.
+
+    The whole catalog is read with two queries, joining `sqlite_master` with
+    the `pragma_table_info` and `pragma_foreign_key_list` table-valued
+    functions, however many tables there are. Internal `sqlite_*` tables
+    and views are skipped. Table and column names are interned, a
+    referenced name being the same object as the one it refers to.
+    """
+    columns = connection.execute(COLUMNS_QUERY).fetchall()
+    references: dict[tuple[str, str], tuple[str, str | None]] = {}
+    for table, column, ref_table, ref_column in connection.execute(FOREIGN_KEYS_QUERY):
+        references[table, column] = (sys.intern(ref_table), ref_column and sys.intern(ref_column))
+
+    primary_keys: dict[str, str] = {}
+    for table, column, _, _, pk in columns:
+        if pk == 1:
+            primary_keys[table] = column
+
+    tables: dict[str, bf.Table] = {}
+    for table_name, column, declared_type, not_null, pk in columns:
+        table_name = sys.intern(table_name)
+        column = sys.intern(column)
+        table = tables.get(table_name)
+        if table is None:
+            table = tables[table_name] = bf.Table(table_name)
+        try:
+            ref_table, ref_column = references[table_name, column]
+        except KeyError:
+            field = read_field(column, declared_type, bool(not_null), pk > 0)
+        else:
+            field = bf.ForeignKeyField(
+                column,
+                type=_field_type(declared_type),
+                ref_table=ref_table,
+                ref_operator=DEFAULT_REF_OPERATOR,
+                # `REFERENCES t` without a column means the primary key of `t`
+                ref_field=ref_column or primary_keys.get(ref_table, 'rowid'),
+                nullable=not not_null,
+            )
+        table.fields.append(field)
+    return list(tables.values())
+
+
+def read_file(filepath: Path) -> list[bf.Table]:
+    """Read the schema of a database file, opened read-only."""
+    connection = sqlite3.connect(f'{Path(filepath).resolve().as_uri()}?mode=ro', uri=True)
+    try:
+        return read_tables(connection)
+    finally:
+        connection.close()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import typing as tp
+
+from .index import TableScanner
+from .iterator import table_lines
+from .table import UMLTable
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class AsyncByteStream(tp.Protocol):
+    async def read(self, n: int = -1) -> bytes:
+        ...
+
+
+def parse_blocks(blocks: list[bytes]) -> list[UMLTable]:
+    return [UMLTable.from_str(table_lines(block.decode())) for block in blocks]
+
+
+async def iterate_blocks(stream: AsyncByteStream, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tp.AsyncIterator[list[bytes]]:
+    """Yield the table blocks completed by each chunk read from `stream`.
+
+    The scan resumes where the previous chunk left it, and only the text
+    after the last complete table is kept, so framing stays linear however
+    large a table is. At the end of the stream an open table, or text
+    other than comments after the last table, raises `ValueError`.
+    """
+    buffer = bytearray()
+    scanner = TableScanner()
+    while True:
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        # only a chunk holding a `}` may complete a table
+        if b'}' not in chunk:
+            continue
+        blocks = [bytes(buffer[start:end]) for _, start, end in scanner.scan(buffer, final=False)]
+        if blocks:
+            yield blocks
+        consumed = scanner.gap
+        if consumed:
+            del buffer[:consumed]
+            scanner.discard(consumed)
+    blocks = [bytes(buffer[start:end]) for _, start, end in scanner.scan(buffer)]
+    if blocks:
+        yield blocks
+    scanner.finish(buffer)
+
+
+class AsyncUMLIterator(tp.AsyncIterator[UMLTable]):
+    """Async counterpart of `UMLIterator` reading from any async byte stream.
+
+    Parsing runs in `executor` (the loop's default one if `None`), one call
+    per batch of tables completed by a chunk, so the event loop only frames
+    blocks. A `ProcessPoolExecutor` works too.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncByteStream,
+        executor: concurrent.futures.Executor | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.__blocks = iterate_blocks(stream, chunk_size)
+        self.__executor = executor
+        self.__pending: list[UMLTable] = []
+
+    def __aiter__(self) -> AsyncUMLIterator:
+        return self
+
+    async def __anext__(self) -> UMLTable:
+        while not self.__pending:
+            blocks = await self.__blocks.__anext__()
+            loop = asyncio.get_running_loop()
+            self.__pending = await loop.run_in_executor(self.__executor, parse_blocks, blocks)
+            self.__pending.reverse()
+        return self.__pending.pop()
@@ -3,11 +3,13 @@ from __future__ import annotations
 import abc
 import dataclasses
 import re
+import sys
 import typing as tp
 
 from typing_extensions import Self
 from erd_converter import base as bf
 
+from .lexer import FieldTokens, parse_ref_option, tokenize_field
 from .utils import get_data_type, get_nullable
 
 
@@ -18,12 +20,20 @@ T = tp.TypeVar('T')
 
 
 class UMLField(bf.BaseField[T]):
-    pass
+    __slots__ = ()
+
+    @classmethod
+    def from_tokens(cls, tokens: FieldTokens) -> Self:
+        return cls(name=tokens.name, nullable=get_nullable(tokens.options))
 
 
 DEFAULT_VARCHAR_SIZE = 256
 
 
+def get_primary_key(options: tp.Sequence[str]) -> bool:
+    return 'pk' in options or 'primary key' in options
+
+
 def parse_size(data: str) -> int:
     match = re.match(r'^varchar(?:\((\d+)\))?$', data)
     if not match:
@@ -32,7 +42,7 @@ def parse_size(data: str) -> int:
     return int(size) if size else DEFAULT_VARCHAR_SIZE
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLVarcharField(UMLField[bf.Varchar]):
     name: str
     size: int
@@ -58,6 +68,16 @@ class UMLVarcharField(UMLField[bf.Varchar]):
         nullable = get_nullable(options_split)
         return cls(name, size=size, primary_key=primary_key, nullable=nullable)
 
+    @classmethod
+    def from_tokens(cls, tokens: FieldTokens) -> Self:
+        options = tokens.options
+        return cls(
+            tokens.name,
+            size=DEFAULT_VARCHAR_SIZE if tokens.size is None else tokens.size,
+            primary_key=get_primary_key(options),
+            nullable=get_nullable(options),
+        )
+
     def __str__(self) -> str:
         options = ''
         if self.nullable:
@@ -71,7 +91,7 @@ class UMLVarcharField(UMLField[bf.Varchar]):
         return f'{self.name} varchar{size}{options}'
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLIntegerField(UMLField[bf.Integer]):
     name: str
     primary_key: bool = False
@@ -95,6 +115,11 @@ class UMLIntegerField(UMLField[bf.Integer]):
 
         return cls(name=name, primary_key=primary_key, nullable=nullable)
 
+    @classmethod
+    def from_tokens(cls, tokens: FieldTokens) -> Self:
+        options = tokens.options
+        return cls(name=tokens.name, primary_key=get_primary_key(options), nullable=get_nullable(options))
+
     def __str__(self) -> str:
         options = ''
         if self.nullable:
@@ -106,7 +131,7 @@ class UMLIntegerField(UMLField[bf.Integer]):
         return f'{self.name} int{options}'
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLBooleanField(UMLField[bf.Boolean]):
     name: str
     nullable: bool = False
@@ -157,7 +182,7 @@ def get_ref(options: list[str]) -> tuple[str, str, str]:
     return parse_ref(ref)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLForeignKeyField(UMLField[bf.ForeignKeyField]):
     name: str
     type: str
@@ -187,6 +212,24 @@ class UMLForeignKeyField(UMLField[bf.ForeignKeyField]):
             nullable=nullable,
         )
 
+    @classmethod
+    def from_tokens(cls, tokens: FieldTokens) -> Self:
+        for option in tokens.options:
+            ref = parse_ref_option(option)
+            if ref is not None:
+                break
+        else:
+            raise ValueError('ref not in options')
+        ref_table, ref_field, ref_operator = ref
+        return cls(
+            name=tokens.name,
+            type=sys.intern(tokens.type),
+            ref_table=ref_table,
+            ref_operator=ref_operator,
+            ref_field=ref_field,
+            nullable=get_nullable(tokens.options),
+        )
+
     def __str__(self) -> str:
         return ''
 
@@ -194,7 +237,7 @@ class UMLForeignKeyField(UMLField[bf.ForeignKeyField]):
 ARRAY_FIELD_PATTERN = re.compile(r'^\s*(?P<variable_name>[a-zA-Z_]\w*)\s+(?P<data_type>\w+(?:\(\d+\))?)\s*(?:\[(?P<values>.*?)\])?\s*(?:\[(?P<options>[\w\s,]+)\])?\s*$')
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLArrayField(UMLField[bf.Array]):
     name: str
     subfield: UMLIntegerField | UMLBooleanField | UMLVarcharField 
@@ -230,8 +273,14 @@ class UMLArrayField(UMLField[bf.Array]):
 
         return cls(name=name, subfield=subfield_)
 
+    @classmethod
+    def from_tokens(cls, tokens: FieldTokens) -> Self:
+        if tokens.subtype is None:
+            raise ValueError(f'Array field `{tokens.name}` has no subtype')
+        return cls(name=tokens.name, subfield=create_uml_field_from_tokens(tokens.subtype))
+
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLJsonField(UMLField[bf.Json]):
     name: str
     nullable: bool = False
@@ -254,7 +303,7 @@ class UMLJsonField(UMLField[bf.Json]):
         return cls(name=name, nullable=nullable)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLDateTimeField(UMLField[bf.DateTime]):
     name: str
     nullable: bool = False
@@ -277,7 +326,7 @@ class UMLDateTimeField(UMLField[bf.DateTime]):
         return cls(name=name, nullable=nullable)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLFloatField(UMLField[bf.Float]):
     name: str
     nullable: bool = False
@@ -300,7 +349,7 @@ class UMLFloatField(UMLField[bf.Float]):
         return cls(name=name, nullable=nullable)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UMLBytesField(UMLField[bf.Bytes]):
     name: str
     nullable: bool = False
@@ -336,11 +385,17 @@ DATA_TYPES : dict[str, UMLField] = {
 }
 
 
-def create_uml_field(line: str):
-    data_type = get_data_type(line)
+def create_uml_field_from_tokens(tokens: FieldTokens) -> UMLField:
+    for option in tokens.options:
+        if option.startswith('ref'):
+            return UMLForeignKeyField.from_tokens(tokens)
 
     try:
-        dtype = DATA_TYPES[data_type]
+        dtype = DATA_TYPES[tokens.data_type]
     except KeyError:
-        raise ValueError(f'Cannot find datatype `{data_type}`')
-    return dtype.from_str(line)
+        raise ValueError(f'Cannot find datatype `{tokens.data_type}`')
+    return dtype.from_tokens(tokens)
+
+
+def create_uml_field(line: str) -> UMLField:
+    return create_uml_field_from_tokens(tokenize_field(line))
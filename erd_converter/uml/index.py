@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import sys
+import typing as tp
+from array import array
+from pathlib import Path
+
+from .table import parse_header
+
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 2
+
+
+def sidecar_path(filepath: Path) -> Path:
+    return filepath.with_name(filepath.name + INDEX_SUFFIX)
+
+
+@dataclasses.dataclass(slots=True)
+class TableSpans(tp.Sequence[tuple[str, int, int]]):
+    """`(name, start, end)` byte ranges of table blocks, kept as columns.
+
+    Offsets live in two `array('q')`, 16 bytes per table instead of a
+    tuple and two int objects.
+    """
+    names: list[str] = dataclasses.field(default_factory=lambda: [])
+    starts: array = dataclasses.field(default_factory=lambda: array('q'))
+    ends: array = dataclasses.field(default_factory=lambda: array('q'))
+
+    def append(self, name: str, start: int, end: int) -> None:
+        self.names.append(name)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @tp.overload
+    def __getitem__(self, i: int) -> tuple[str, int, int]: ...
+
+    @tp.overload
+    def __getitem__(self, i: slice) -> TableSpans: ...
+
+    def __getitem__(self, i: int | slice) -> tuple[str, int, int] | TableSpans:
+        if isinstance(i, slice):
+            return TableSpans(self.names[i], self.starts[i], self.ends[i])
+        return self.names[i], self.starts[i], self.ends[i]
+
+    def __iter__(self) -> tp.Iterator[tuple[str, int, int]]:
+        return zip(self.names, self.starts, self.ends)
+
+
+def _check_gap(gap: bytes) -> None:
+    """Raise `ValueError`, as `UMLIterator` does, on any text between tables but comments."""
+    for line in gap.splitlines():
+        line = line.strip()
+        if line and not line.startswith(b'//'):
+            text = line.decode(errors='replace')
+            parse_header(text)
+            raise ValueError(f'Incorrect line {text}')
+
+
+@dataclasses.dataclass(slots=True)
+class TableScanner:
+    """State of `scan_table_spans`, so a growing buffer is scanned once.
+
+    `scan` resumes where the previous call stopped; unless `final` it
+    leaves an incomplete last line for the next call. `discard` shifts the
+    offsets after the caller dropped the start of its buffer.
+    """
+    strict: bool = False
+    # next line to look at
+    pos: int = 0
+    # start of the open table, -1 between tables
+    start: int = -1
+    name: str = ''
+    # start of the text after the last table
+    gap: int = 0
+
+    def scan(self, buffer: tp.Any, final: bool = True) -> TableSpans:
+        spans = TableSpans()
+        size = len(buffer)
+        pos, start, name, gap = self.pos, self.start, self.name, self.gap
+        while True:
+            brace = buffer.find(b'{' if start == -1 else b'}', pos)
+            if brace == -1:
+                if not final:
+                    # the complete lines left hold no brace
+                    pos = max(pos, buffer.rfind(b'\n', pos) + 1)
+                break
+            line_start = buffer.rfind(b'\n', 0, brace) + 1
+            newline = buffer.find(b'\n', brace)
+            if newline == -1 and not final:
+                pos = line_start
+                break
+            line_end = size if newline == -1 else newline + 1
+            line = buffer[line_start:line_end].strip()
+            if start == -1:
+                if line.startswith(b'table') and line.endswith(b'{'):
+                    parts = line.split()
+                    if len(parts) == 3:
+                        if self.strict:
+                            _check_gap(buffer[gap:line_start])
+                        start = line_start
+                        name = sys.intern(parts[1].decode())
+            elif line == b'}':
+                spans.append(name, start, line_end)
+                start = -1
+                gap = line_end
+            pos = line_end
+        self.pos, self.start, self.name, self.gap = pos, start, name, gap
+        if final and self.strict:
+            self.finish(buffer)
+        return spans
+
+    def finish(self, buffer: tp.Any) -> None:
+        """Raise `ValueError` if a table is still open or other text than comments follows the last one."""
+        if self.start != -1:
+            raise ValueError(f'Table `{self.name}` is not closed')
+        _check_gap(buffer[self.gap:])
+
+    def discard(self, count: int) -> None:
+        self.pos -= count
+        self.gap -= count
+        if self.start != -1:
+            self.start -= count
+
+
+def scan_table_spans(buffer: tp.Union[bytes, tp.Any], strict: bool = False) -> TableSpans:
+    """Find the byte ranges of every `table ... { ... }` block.
+
+    `buffer` is anything supporting `find`, `rfind` and slicing over bytes,
+    e.g. `bytes` or `mmap.mmap`. Only a line holding a `{` can be a header
+    and only one holding a `}` can close a table, so the buffer is searched
+    for those bytes in C and Python looks at about two lines per table,
+    however many field, blank or comment lines there are.
+
+    A table left open at the end is ignored (it may be a partial read) and
+    text between tables skipped, unless `strict`: then both raise
+    `ValueError`, like a malformed `table ... {` header does.
+    """
+    return TableScanner(strict).scan(buffer)
+
+
+@dataclasses.dataclass
+class TableIndex:
+    size: int
+    mtime_ns: int
+    spans: TableSpans = dataclasses.field(default_factory=TableSpans)
+    _by_name: dict[str, tuple[int, int]] = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._by_name = {name: (start, end) for name, start, end in self.spans}
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def names(self) -> list[str]:
+        return list(self.spans.names)
+
+    def span(self, name: str) -> tuple[int, int]:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise KeyError(f'Table `{name}` not found') from None
+
+    def is_valid_for(self, stat: os.stat_result) -> bool:
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+    @classmethod
+    def build(cls, buffer: tp.Any, stat: os.stat_result) -> TableIndex:
+        return cls(size=stat.st_size, mtime_ns=stat.st_mtime_ns, spans=scan_table_spans(buffer))
+
+    def save(self, path: Path) -> None:
+        data = {
+            'version': INDEX_VERSION,
+            'size': self.size,
+            'mtime_ns': self.mtime_ns,
+            'names': self.spans.names,
+            'starts': self.spans.starts.tolist(),
+            'ends': self.spans.ends.tolist(),
+        }
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> TableIndex | None:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != INDEX_VERSION:
+            return None
+        spans = TableSpans([sys.intern(name) for name in data['names']], array('q', data['starts']), array('q', data['ends']))
+        return cls(size=data['size'], mtime_ns=data['mtime_ns'], spans=spans)
+
+    @classmethod
+    def for_file(cls, filepath: Path, buffer: tp.Any, use_sidecar: bool = True) -> TableIndex:
+        """Load the sidecar index of `filepath` if it is still fresh, else rebuild it."""
+        stat = os.stat(filepath)
+        path = sidecar_path(filepath)
+        if use_sidecar:
+            index = cls.load(path)
+            if index is not None and index.is_valid_for(stat):
+                return index
+        index = cls.build(buffer, stat)
+        if use_sidecar:
+            try:
+                index.save(path)
+            except OSError:
+                pass
+        return index
@@ -1,20 +1,59 @@
 from __future__ import annotations
 
+import mmap
 import typing as tp
 from pathlib import Path
 
-from .table import UMLTable
+from .index import TableIndex, scan_table_spans
+from .table import LazyUMLTable, UMLTable
+
+
+def table_lines(text: str) -> list[str]:
+    """Drop blank and `//` comment lines from a raw table block."""
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    return lines
 
 
 class UMLIterator(tp.Iterator[UMLTable]):
-    def __init__(self, filepath: Path) -> None:
-        self.__filepath = filepath
+    """Iterate over the tables of a DBML file.
+
+    By default the file is read line by line from the start. With
+    `use_mmap=True` the file is memory-mapped and a table index (kept in a
+    `<file>.idx` sidecar unless `use_sidecar=False`) allows jumping straight
+    to given tables with `get_table` / `get_tables`. With `lazy=True` tables
+    are `LazyUMLTable`s whose fields are parsed on first access.
+    """
+
+    def __init__(self, filepath: Path, use_mmap: bool = False, use_sidecar: bool = True, lazy: bool = False) -> None:
+        self.__filepath = Path(filepath)
+        self.__table_cls: type[UMLTable] = LazyUMLTable if lazy else UMLTable
+        self.__use_mmap = use_mmap
+        self.__use_sidecar = use_sidecar
+        self.__mmap: mmap.mmap | bytes | None = None
+        self.__index: TableIndex | None = None
+        self.__position = 0
 
     def __enter__(self) -> UMLIterator:
-        self.__file = open(self.__filepath, 'r')
+        if self.__use_mmap:
+            self.__file = open(self.__filepath, 'rb')
+            try:
+                self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files cannot be mapped
+                self.__mmap = b''
+            self.__position = 0
+        else:
+            self.__file = open(self.__filepath, 'r')
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if isinstance(self.__mmap, mmap.mmap):
+            self.__mmap.close()
+        self.__mmap = None
         if not self.__file.closed:
             self.__file.close()
 
@@ -22,15 +61,49 @@ class UMLIterator(tp.Iterator[UMLTable]):
         return self
 
     def __next__(self) -> UMLTable:
+        if self.__use_mmap:
+            return self.__next_indexed()
         lines = []
-        while True:
-            try:
-                line = next(self.__file)
-            except StopIteration:
-                raise StopIteration()
-            if not line.strip() or line.strip().startswith('//'):
+        for line in self.__file:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('//'):
                 continue
-            elif line.strip() == '}':
-                lines.append(line)
-                return UMLTable.from_str(lines)
             lines.append(line)
+            if stripped == '}':
+                return self.__table_cls.from_str(lines)
+        if lines:
+            raise ValueError(f'Table is not closed: {lines[0].strip()}')
+        raise StopIteration()
+
+    @property
+    def index(self) -> TableIndex:
+        if self.__mmap is None:
+            raise RuntimeError('Random access requires use_mmap=True inside the `with` block')
+        if self.__index is None:
+            self.__index = TableIndex.for_file(self.__filepath, self.__mmap, self.__use_sidecar)
+        return self.__index
+
+    def __read_table(self, start: int, end: int) -> UMLTable:
+        text = self.__mmap[start:end].decode()
+        return self.__table_cls.from_str(table_lines(text))
+
+    def __next_indexed(self) -> UMLTable:
+        spans = self.index.spans
+        if self.__position >= len(spans):
+            if self.__position == len(spans):
+                self.__position += 1
+                tail = spans[-1][2] if spans else 0
+                scan_table_spans(self.__mmap[tail:], strict=True)
+            raise StopIteration()
+        _, start, end = spans[self.__position]
+        self.__position += 1
+        return self.__read_table(start, end)
+
+    def table_names(self) -> list[str]:
+        return self.index.names()
+
+    def get_table(self, name: str) -> UMLTable:
+        return self.__read_table(*self.index.span(name))
+
+    def get_tables(self, names: tp.Iterable[str]) -> list[UMLTable]:
+        return [self.get_table(name) for name in names]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import sys
+import typing as tp
+
+from erd_converter.base.field import ARRAY_SUBFIELD_NAME
+
+
+class UMLSyntaxError(ValueError):
+    def __init__(self, message: str, line: str, column: int = 0) -> None:
+        super().__init__(f'{message}: {line.strip()}')
+        self.message = message
+        self.line = line
+        self.column = column
+
+
+class FieldTokens(tp.NamedTuple):
+    name: str
+    type: str
+    data_type: str
+    size: int | None = None
+    subtype: FieldTokens | None = None
+    options: tp.Sequence[str] = ()
+
+
+def _column(line: str, part: str) -> int:
+    found = line.find(part) if part else -1
+    return found if found != -1 else len(line.rstrip())
+
+
+def _matching_bracket(text: str, pos: int) -> int:
+    """Return index of `]` closing the `[` at `pos`, or -1."""
+    depth = 0
+    for i in range(pos, len(text)):
+        char = text[i]
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if not depth:
+                return i
+    return -1
+
+
+def _scan_options(line: str, text: str) -> list[str]:
+    """Scan the body of `[opt, opt, ...]`; `text` starts right after `[`."""
+    if text[-1:] != ']':
+        raise UMLSyntaxError('Unclosed options', line, _column(line, '[' + text))
+    return [option.strip() for option in text[:-1].lower().split(',')]
+
+
+def _scan_declaration(line: str, name: str, text: str) -> FieldTokens:
+    """Scan `type[(size)][[subtype]] [[options]]` from `text`."""
+    head, bracket, tail = text.partition('[')
+    type_text = head.rstrip()
+    data_type, paren, size_text = type_text.partition('(')
+    if not data_type.isalnum():
+        raise UMLSyntaxError('Expected data type', line, _column(line, text))
+
+    size = None
+    if paren:
+        if size_text[-1:] != ')' or not size_text[:-1].isdigit():
+            raise UMLSyntaxError('Invalid size', line, _column(line, paren + size_text))
+        size = int(size_text[:-1])
+    data_type = data_type.lower()
+
+    if not bracket:
+        return FieldTokens(name, type_text, data_type, size)
+
+    if data_type == 'array' and head == type_text:
+        rest = bracket + tail
+        close = _matching_bracket(rest, 0)
+        if close == -1:
+            raise UMLSyntaxError('Unclosed array subtype', line, _column(line, rest))
+        subtype = _scan_declaration(line, ARRAY_SUBFIELD_NAME, rest[1:close].strip())
+        rest = rest[close + 1:].lstrip()
+        if not rest:
+            return FieldTokens(name, data_type, data_type, size, subtype)
+        if rest[0] != '[':
+            raise UMLSyntaxError('Unexpected text', line, _column(line, rest))
+        return FieldTokens(name, data_type, data_type, size, subtype, _scan_options(line, rest[1:]))
+
+    return FieldTokens(name, type_text, data_type, size, None, _scan_options(line, tail))
+
+
+def tokenize_field(line: str) -> FieldTokens:
+    """Split a DBML field line into its parts in a single left-to-right pass.
+
+    Only `str.split`/`str.partition` style primitives are used, so the cost
+    is linear in the length of the line whatever the option list holds.
+    The field name is interned: every table repeats `id`, `created_at`...
+    and one string object is kept per distinct name.
+    """
+    parts = line.split(None, 1)
+    if len(parts) != 2:
+        raise UMLSyntaxError('Missing data type', line, len(line.rstrip()))
+    name, text = parts
+    if not name.isidentifier():
+        raise UMLSyntaxError('Invalid field name', line, _column(line, name))
+    return _scan_declaration(line, sys.intern(name), text.rstrip())
+
+
+def parse_ref_option(option: str) -> tuple[str, str, str] | None:
+    """Parse `ref: > table.field` into `(table, field, operator)`, names interned."""
+    if not option.startswith('ref'):
+        return None
+    rest = option[3:].lstrip()
+    if not rest.startswith(':'):
+        return None
+    rest = rest[1:].lstrip()
+    if not rest or rest[0] not in '<>-':
+        raise ValueError(f'incorrect ref:{option}')
+    operator = rest[0]
+    table, dot, field = rest[1:].strip().partition('.')
+    if not dot or not table.isidentifier() or not field.isidentifier():
+        raise ValueError(f'incorrect ref:{option}')
+    return sys.intern(table), sys.intern(field), operator
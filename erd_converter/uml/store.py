@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import typing as tp
+from pathlib import Path
+
+from erd_converter.base.store import NULLABLE, PRIMARY_KEY, SUB_NULLABLE, SUB_PRIMARY_KEY, SchemaStore, TypeCode
+
+from .field import DEFAULT_VARCHAR_SIZE, get_primary_key
+from .index import scan_table_spans
+from .iterator import table_lines
+from .lexer import FieldTokens, parse_ref_option, tokenize_field
+from .utils import get_nullable
+
+
+DATA_TYPE_CODES: dict[str, TypeCode] = {
+    'varchar': TypeCode.VARCHAR,
+    'int': TypeCode.INTEGER,
+    'array': TypeCode.ARRAY,
+    'json': TypeCode.JSON,
+    'boolean': TypeCode.BOOLEAN,
+    'datetime': TypeCode.DATETIME,
+    'float': TypeCode.FLOAT,
+    'bytea': TypeCode.BYTES,
+}
+
+
+def _type_code(tokens: FieldTokens) -> TypeCode:
+    try:
+        return DATA_TYPE_CODES[tokens.data_type]
+    except KeyError:
+        raise ValueError(f'Cannot find datatype `{tokens.data_type}`')
+
+
+def _flags(options: tp.Sequence[str]) -> int:
+    flags = NULLABLE if get_nullable(options) else 0
+    if get_primary_key(options):
+        flags |= PRIMARY_KEY
+    return flags
+
+
+def add_field_tokens(store: SchemaStore, tokens: FieldTokens) -> None:
+    """Append the field described by `tokens` to the current table of `store`."""
+    options = tokens.options
+    for option in options:
+        ref = parse_ref_option(option)
+        if ref is not None:
+            ref_table, ref_field, ref_operator = ref
+            store.add_field(
+                tokens.name, TypeCode.FOREIGN_KEY, _flags(options) & NULLABLE,
+                fk_type=tokens.type,
+                ref_table=ref_table,
+                ref_field=ref_field,
+                ref_operator=ref_operator,
+            )
+            return
+
+    code = _type_code(tokens)
+    flags = _flags(options)
+    if code is TypeCode.ARRAY:
+        subtype = tokens.subtype
+        if subtype is None:
+            raise ValueError(f'Array field `{tokens.name}` has no subtype')
+        sub_code = _type_code(subtype)
+        sub_flags = _flags(subtype.options)
+        size = DEFAULT_VARCHAR_SIZE if sub_code is TypeCode.VARCHAR and subtype.size is None else subtype.size or 0
+        flags = SUB_NULLABLE if sub_flags & NULLABLE else 0
+        if sub_flags & PRIMARY_KEY:
+            flags |= SUB_PRIMARY_KEY
+        store.add_field(tokens.name, code, flags, size=size, sub_type=sub_code)
+    elif code is TypeCode.VARCHAR:
+        store.add_field(tokens.name, code, flags, size=DEFAULT_VARCHAR_SIZE if tokens.size is None else tokens.size)
+    else:
+        store.add_field(tokens.name, code, flags if code is TypeCode.INTEGER else flags & NULLABLE)
+
+
+def add_table_lines(store: SchemaStore, lines: tp.Iterable[str]) -> int:
+    """Parse one table block (as given to `UMLTable.from_str`) straight into `store`."""
+    lines = iter(lines)
+    first_line = next(lines).strip()
+    if not first_line.startswith('table') or not first_line.endswith('{'):
+        raise ValueError(f'Incorrect firstline in table {first_line}')
+    try:
+        _, table_name, _ = first_line.split()
+    except ValueError:
+        raise ValueError(f'Incorrect line {first_line}')
+    index = store.begin_table(table_name)
+    for line in lines:
+        line = line.strip()
+        if line == '}':
+            break
+        add_field_tokens(store, tokenize_field(line))
+    return index
+
+
+def load_store(filepath: Path, store: SchemaStore | None = None) -> SchemaStore:
+    """Parse a whole DBML file into a `SchemaStore` without building field objects."""
+    store = SchemaStore() if store is None else store
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    for _, start, end in scan_table_spans(data, strict=True):
+        add_table_lines(store, table_lines(data[start:end].decode()))
+    return store
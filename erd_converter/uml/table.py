@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
+import sys
 import typing as tp
 
 from typing_extensions import Self
@@ -9,7 +10,30 @@ from erd_converter import base
 from . import field as f
 
 
-@dataclasses.dataclass
+def parse_header(line: str) -> str:
+    """Table name (interned) from a `table <name> {` line."""
+    first_line = line.strip()
+    if not first_line.startswith('table') or not first_line.endswith('{'):
+        raise ValueError(f'Incorrect firstline in table {first_line}')
+    try:
+        _, table_name, _ = first_line.split()
+    except ValueError:
+        raise ValueError(f'Incorrect line {first_line}')
+    return sys.intern(table_name)
+
+
+def field_lines(lines: tp.Iterator[str]) -> list[str]:
+    """Stripped field lines up to (not including) the closing `}`."""
+    result = []
+    for line in lines:
+        line = line.strip()
+        if line == '}':
+            break
+        result.append(line)
+    return result
+
+
+@dataclasses.dataclass(slots=True)
 class UMLTable(base.BaseTable):
     name: str
     fields: list[f.UMLField] = dataclasses.field(default_factory=lambda: [])
@@ -19,17 +43,46 @@ class UMLTable(base.BaseTable):
     @classmethod
     def from_str(cls, lines: tp.Iterable[str]) -> Self:
         lines = iter(lines)
-        first_line = next(lines).strip()
-        if not first_line.startswith('table') or not first_line.endswith('{'):
-            raise ValueError(f'Incorrect firstline in table {first_line}')
-        try:
-            _, table_name, _ = first_line.split()
-        except ValueError:
-            raise ValueError(f'Incorrect line {first_line}')
-        table = cls(table_name)
+        table = cls(parse_header(next(lines)))
         for line in lines:
             line = line.strip()
             if line == '}':                
                 return table
             field = f.create_uml_field(line)
             table.fields.append(field)
+
+
+class LazyUMLTable(UMLTable):
+    """A `UMLTable` that keeps its raw field lines and parses them on first access to `fields`.
+
+    Reading only names (or a few tables) of a large file then costs little
+    more than finding the table boundaries.
+    """
+    __slots__ = ('_lines', '_parsed')
+
+    def __init__(self, name: str, lines: list[str]) -> None:
+        self.name = name
+        self._lines: list[str] | None = lines
+        self._parsed: list[f.UMLField] | None = None
+
+    @classmethod
+    def from_str(cls, lines: tp.Iterable[str]) -> Self:
+        lines = iter(lines)
+        name = parse_header(next(lines))
+        return cls(name, field_lines(lines))
+
+    @property
+    def parsed(self) -> bool:
+        return self._parsed is not None
+
+    @property
+    def fields(self) -> list[f.UMLField]:
+        if self._parsed is None:
+            self._parsed = [f.create_uml_field(line) for line in self._lines]
+            self._lines = None
+        return self._parsed
+
+    @fields.setter
+    def fields(self, fields: list[f.UMLField]) -> None:
+        self._parsed = fields
+        self._lines = None
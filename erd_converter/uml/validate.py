@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import dataclasses
+import typing as tp
+from pathlib import Path
+
+from erd_converter.base.graph import SchemaIndex
+from erd_converter.base.table import Table
+from .field import UMLField, UMLForeignKeyField, create_uml_field
+from .lexer import UMLSyntaxError
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Issue:
+    """A problem at a 1-based `line` and `column` of `file` (0 when it has no source text)."""
+    file: str
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f'{self.file}:{self.line}:{self.column}: {self.message}'
+
+
+@dataclasses.dataclass
+class ValidationReport:
+    file: str
+    tables: int = 0
+    fields: int = 0
+    issues: list[Issue] = dataclasses.field(default_factory=lambda: [])
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def as_dict(self) -> dict[str, tp.Any]:
+        return dataclasses.asdict(self)
+
+
+class _Validator:
+    def __init__(self, file: str) -> None:
+        self.report = ValidationReport(file)
+        self.table: str | None = None
+        self.table_line = 0
+        self.tables: dict[str, int] = {}
+        self.fields: dict[str, int] = {}
+        self.refs: list[tuple[int, int, UMLForeignKeyField]] = []
+        self.columns: set[tuple[str, str]] = set()
+
+    def error(self, line: int, column: int, message: str) -> None:
+        self.report.issues.append(Issue(self.report.file, line, column, message))
+
+    def open_table(self, number: int, line: str, stripped: str) -> None:
+        parts = stripped.split()
+        column = line.find(stripped) + 1
+        if len(parts) != 3 or parts[0] != 'table' or not stripped.endswith('{') or not parts[1].isidentifier():
+            self.error(number, column, f'Incorrect table header `{stripped}`')
+            # still read its fields so they get checked too
+            name = None
+        else:
+            name = parts[1]
+            if name in self.tables:
+                self.error(number, column, f'Table `{name}` already defined on line {self.tables[name]}')
+            else:
+                self.tables[name] = number
+            self.report.tables += 1
+        self.table = name or ''
+        self.table_line = number
+        self.fields = {}
+
+    def add_field(self, number: int, line: str) -> None:
+        try:
+            field: UMLField = create_uml_field(line)
+        except UMLSyntaxError as e:
+            self.error(number, e.column + 1, e.message)
+            return
+        except ValueError as e:
+            self.error(number, line.find(line.strip()) + 1, str(e))
+            return
+        self.report.fields += 1
+        column = line.find(field.name) + 1
+        if field.name in self.fields:
+            self.error(number, column, f'Field `{field.name}` already defined on line {self.fields[field.name]}')
+        else:
+            self.fields[field.name] = number
+        self.columns.add((self.table, field.name))
+        if isinstance(field, UMLForeignKeyField):
+            self.refs.append((number, line.lower().find('ref:') + 1, field))
+
+    def feed(self, number: int, line: str) -> None:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('//'):
+            return
+        if self.table is None:
+            if stripped.startswith('table') or stripped.endswith('{'):
+                self.open_table(number, line, stripped)
+            else:
+                self.error(number, line.find(stripped) + 1, f'Unexpected text outside a table `{stripped}`')
+        elif stripped == '}':
+            self.table = None
+        elif stripped.startswith('table ') and stripped.endswith('{'):
+            # a missing `}`: resynchronise on the next header
+            self.error(self.table_line, 1, f'Table `{self.table}` is not closed')
+            self.open_table(number, line, stripped)
+        else:
+            self.add_field(number, line)
+
+    def finish(self) -> ValidationReport:
+        if self.table is not None:
+            self.error(self.table_line, 1, f'Table `{self.table}` is not closed')
+        for number, column, field in self.refs:
+            if field.ref_table not in self.tables:
+                self.error(number, column, f'Reference to unknown table `{field.ref_table}`')
+            elif (field.ref_table, field.ref_field) not in self.columns:
+                self.error(number, column, f'Reference to unknown field `{field.ref_table}.{field.ref_field}`')
+        self.report.issues.sort(key=lambda issue: (issue.line, issue.column))
+        return self.report
+
+
+def validate_lines(lines: tp.Iterable[str], file: str = '<string>') -> ValidationReport:
+    """Check every table and field of a DBML document, collecting all problems.
+
+    Unlike `UMLTable.from_str` nothing is raised: a bad field line is
+    reported and skipped, and a missing `}` is reported when the next
+    table header (or the end of input) is reached, so one pass lists every
+    issue. Foreign key targets are checked once the whole input was read.
+    """
+    validator = _Validator(file)
+    for number, line in enumerate(lines, 1):
+        validator.feed(number, line.rstrip('\r\n'))
+    return validator.finish()
+
+
+def validate_file(filepath: Path) -> ValidationReport:
+    with open(filepath) as f:
+        return validate_lines(f, str(filepath))
+
+
+def validate_tables(tables: tp.Iterable[Table], file: str = '<tables>') -> ValidationReport:
+    """Check the foreign key targets of already read base tables (a database, compiled schema...)."""
+    report = ValidationReport(file)
+    index = SchemaIndex(tables)
+    report.tables = len(index.tables)
+    report.fields = len(index.fields)
+    for ref in index.dangling():
+        if ref.ref_table not in index.tables:
+            message = f'Reference to unknown table `{ref.ref_table}`'
+        else:
+            message = f'Reference to unknown field `{ref.ref_table}.{ref.ref_field}`'
+        report.issues.append(Issue(file, 0, 0, f'{ref.table}.{ref.field}: {message}'))
+    return report
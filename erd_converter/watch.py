@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import time
+import typing as tp
+from pathlib import Path
+
+from erd_converter.cache import TableCache
+from erd_converter.convert import render_table, sorted_texts
+from erd_converter.uml.index import scan_table_spans
+from erd_converter.uml.iterator import table_lines
+from erd_converter.uml.table import UMLTable
+
+
+@dataclasses.dataclass
+class ConvertedBlock:
+    table: UMLTable
+    text: str
+
+
+@dataclasses.dataclass
+class UpdateResult:
+    converted: list[str]
+    removed: int
+    seconds: float
+    error: str | None = None
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.converted or self.removed)
+
+
+class IncrementalConverter:
+    """Keep parsed tables of `file` in memory and re-convert only edited blocks.
+
+    Blocks are keyed by their raw bytes, so moving a table around or
+    touching another one never re-parses it. With `sort` models are
+    written in foreign key dependency order (see `sorted_texts`). A `cache`
+    also keeps rendered tables across runs, e.g. when watching restarts.
+    """
+
+    def __init__(self, file: Path, res_file: Path, sort: bool = True, cache: TableCache | None = None) -> None:
+        self.file = Path(file)
+        self.res_file = Path(res_file)
+        self.sort = sort
+        self.cache = cache
+        self.__blocks: dict[bytes, ConvertedBlock] = {}
+        self.__order: list[bytes] = []
+
+    @property
+    def tables(self) -> list[UMLTable]:
+        return [self.__blocks[block].table for block in self.__order]
+
+    def update(self) -> UpdateResult:
+        """Re-read the input, convert changed blocks and rewrite the output if needed."""
+        started = time.perf_counter()
+        with open(self.file, 'rb') as f:
+            data = f.read()
+
+        blocks = {}
+        order = []
+        converted = []
+        for name, start, end in scan_table_spans(data, strict=True):
+            block = data[start:end]
+            order.append(block)
+            if block in blocks:
+                continue
+            entry = self.__blocks.get(block)
+            if entry is None:
+                table = UMLTable.from_str(table_lines(block.decode()))
+                if self.cache is not None:
+                    text = self.cache.get_or_render(block, lambda _: render_table(table))
+                else:
+                    text = render_table(table)
+                entry = ConvertedBlock(table=table, text=text)
+                converted.append(name)
+            blocks[block] = entry
+
+        removed = len(self.__blocks.keys() - blocks.keys())
+        reordered = order != self.__order
+        self.__blocks = blocks
+        self.__order = order
+        if converted or removed or reordered:
+            self.__write()
+        return UpdateResult(converted=converted, removed=removed, seconds=time.perf_counter() - started)
+
+    def __write(self) -> None:
+        tmp_path = self.res_file.with_name(self.res_file.name + '.tmp')
+        texts = [self.__blocks[block].text for block in self.__order]
+        with open(tmp_path, 'w') as wf:
+            wf.writelines(sorted_texts(self.__order, texts) if self.sort else texts)
+        os.replace(tmp_path, self.res_file)
+
+
+def watch(
+    file: Path,
+    res_file: Path,
+    interval: float = 0.2,
+    on_update: tp.Callable[[UpdateResult], None] | None = None,
+    should_stop: tp.Callable[[], bool] = lambda: False,
+    sort: bool = True,
+    cache: TableCache | None = None,
+) -> None:
+    """Poll `file` every `interval` seconds and keep `res_file` up to date."""
+    converter = IncrementalConverter(file, res_file, sort, cache)
+    last_stat = None
+    while not should_stop():
+        try:
+            stat = os.stat(file)
+        except FileNotFoundError:
+            # editors may replace the file by renaming a new one over it
+            time.sleep(interval)
+            continue
+        current = (stat.st_size, stat.st_mtime_ns)
+        if current != last_stat:
+            last_stat = current
+            try:
+                result = converter.update()
+            except ValueError as e:
+                # keep watching, the file is probably being edited
+                result = UpdateResult(converted=[], removed=0, seconds=0.0, error=str(e))
+            if on_update is not None:
+                on_update(result)
+        time.sleep(interval)
@@ -1,29 +1,241 @@
 from __future__ import annotations
 
-import typing as tp
+import contextlib
+import json
 from pathlib import Path
 
 import typer
 
-from erd_converter.peewee.table import PeeweeTable
-from erd_converter.uml.iterator import UMLIterator
+from erd_converter.base import binary
+from erd_converter.bytecode import compile_module, compile_modules
+from erd_converter.batch import MANIFEST_NAME, find_inputs, run_batch
+from erd_converter.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, TableCache
+from erd_converter.base.diff import diff_tables
+from erd_converter.convert import convert_file_to, iterate_tables_from_uml_file, iterate_tables_parallel, read_tables
+from erd_converter.peewee.migrate import render_affected, render_migration
+from erd_converter.peewee.reader import gc_paused
+from erd_converter.peewee.package import write_package
+from erd_converter.profile import Profiler
+from erd_converter.sqlite.introspect import SQLITE_SUFFIXES
+from erd_converter.uml.store import load_store
+from erd_converter.uml.validate import validate_file, validate_tables
+from erd_converter.watch import UpdateResult, watch as watch_file
 
 
-def iterate_tables_from_uml_file(file: Path) -> tp.Iterator[str] :
-    with UMLIterator(file) as uml:
-        for table in uml:
-            peewee_table = PeeweeTable.from_table(table.to_table())
-            yield str(peewee_table)
-    
+app = typer.Typer()
 
+
+def report_update(result: UpdateResult) -> None:
+    if result.error is not None:
+        typer.echo(f'error: {result.error}', err=True)
+    elif result.changed:
+        typer.echo(f'converted {len(result.converted)} table(s), removed {result.removed} in {result.seconds * 1000:.1f} ms')
+
+
+@app.callback(invoke_without_command=True)
+def legacy(
+    ctx: typer.Context,
+    file: Path = typer.Option(None, exists=True, dir_okay=False, readable=True, help='Same as `convert --file`.'),
+    res_file: Path = typer.Option(None, exists=False, help='Same as `convert --res-file`.'),
+) -> None:
+    """Keep `python main.py --file x --res-file y` working as `convert` with default options."""
+    if ctx.invoked_subcommand is not None:
+        if file is not None or res_file is not None:
+            raise typer.BadParameter('--file and --res-file go after the command name', ctx=ctx)
+        return
+    if file is None or res_file is None:
+        typer.echo(ctx.get_help())
+        raise typer.Exit(0 if file is None and res_file is None else 2)
+    # invoking the click command fills in the defaults of its other options
+    ctx.invoke(ctx.command.get_command(ctx, 'convert'), file=file, res_file=res_file)
+
+
+@app.command('convert')
 def main(
     file: Path = typer.Option(..., exists=True, dir_okay=False, readable=True),
     res_file: Path = typer.Option(..., exists=False),
+    workers: int = typer.Option(1, min=1, help='Convert in N processes, sharding the file on table boundaries.'),
+    cache: bool = typer.Option(True, '--cache/--no-cache', help='Reuse rendered tables whose DBML did not change.'),
+    cache_dir: Path = typer.Option(DEFAULT_CACHE_DIR, file_okay=False),
+    cache_max_size: int = typer.Option(DEFAULT_MAX_BYTES // 2**20, min=0, help='Cache size limit in MiB.'),
+    watch: bool = typer.Option(False, '--watch', help='Keep running and re-convert only edited tables on change.'),
+    sort: bool = typer.Option(True, '--sort/--no-sort', help='Emit models in foreign key dependency order.'),
+    profile: Path = typer.Option(None, dir_okay=False, help='Write per-stage timings and counters of this process as JSON.'),
+    split: int = typer.Option(0, min=0, help='Write RES_FILE as a package with N models per module, loaded lazily.'),
+    defer_fks: bool = typer.Option(
+        False,
+        '--defer-fks',
+        help='Keep file order in a single pass, emitting keys to models defined later as DeferredForeignKey. '
+        'Ignores --sort, --cache and --workers.',
+    ),
+    bytecode: bool = typer.Option(False, '--bytecode', help='Also write reproducible __pycache__ bytecode (checked hash).'),
+) -> None:
+    profiler = Profiler() if profile is not None else None
+    with profiler if profiler is not None else contextlib.nullcontext():
+        if watch:
+            check_watch_options(file, workers, split, defer_fks)
+            run_watch(file, res_file, cache, cache_dir, cache_max_size, sort, bytecode)
+        elif split:
+            with gc_paused():
+                tables = read_tables(file)
+            write_package(tables, res_file, tables_per_module=split)
+            if bytecode:
+                compile_modules(res_file.glob('*.py'), root=res_file.parent)
+        else:
+            convert(file, res_file, workers, cache, cache_dir, cache_max_size, sort, defer_fks)
+            if bytecode:
+                compile_module(res_file)
+    if profiler is not None:
+        profiler.dump(profile)
+
+
+def check_watch_options(file: Path, workers: int, split: int, defer_fks: bool) -> None:
+    """Reject options `--watch` cannot honour: it converts edited DBML blocks one by one in this process."""
+    if file.suffix in (binary.SCHEMA_SUFFIX, *SQLITE_SUFFIXES):
+        raise typer.BadParameter('--watch only reads DBML files', param_hint='--file')
+    if workers > 1:
+        raise typer.BadParameter('--watch converts in a single process', param_hint='--workers')
+    if split:
+        raise typer.BadParameter('--watch writes a single module', param_hint='--split')
+    if defer_fks:
+        raise typer.BadParameter('--watch emits models with --sort or in file order', param_hint='--defer-fks')
+
+
+def run_watch(
+    file: Path,
+    res_file: Path,
+    cache: bool,
+    cache_dir: Path,
+    cache_max_size: int,
+    sort: bool,
+    bytecode: bool,
+) -> None:
+    table_cache = None
+    if cache:
+        table_cache = TableCache(cache_dir, max_bytes=cache_max_size * 2**20, options={'sort': sort})
+
+    def on_update(result: UpdateResult) -> None:
+        report_update(result)
+        if bytecode and result.error is None:
+            compile_module(res_file)
+
+    try:
+        watch_file(file, res_file, on_update=on_update, sort=sort, cache=table_cache)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if table_cache is not None:
+            table_cache.evict()
+
+
+def convert(
+    file: Path,
+    res_file: Path,
+    workers: int,
+    cache: bool,
+    cache_dir: Path,
+    cache_max_size: int,
+    sort: bool,
+    defer_fks: bool = False,
 ) -> None:
+    # the cache and the pool work on DBML text; other inputs are read as a whole
+    dbml = file.suffix not in (binary.SCHEMA_SUFFIX, *SQLITE_SUFFIXES)
+    # deferring forward keys is a single streaming pass, without the cache or the pool
+    streamed = not dbml or defer_fks
+    table_cache = None
+    if cache and not streamed:
+        table_cache = TableCache(cache_dir, max_bytes=cache_max_size * 2**20, options={'sort': sort})
 
     with open(res_file, 'w') as wf:
-        wf.writelines(iterate_tables_from_uml_file(file))
+        if streamed:
+            convert_file_to(file, wf, sort=sort, defer_forward=defer_fks)
+        elif workers > 1:
+            wf.writelines(iterate_tables_parallel(file, workers, cache=table_cache, sort=sort))
+        elif table_cache is not None:
+            wf.writelines(iterate_tables_from_uml_file(file, cache=table_cache, sort=sort))
+        else:
+            convert_file_to(file, wf, sort=sort)
+
+    if table_cache is not None:
+        table_cache.evict()
+
+
+@app.command('batch')
+def batch(
+    inputs: str = typer.Argument(..., help='Directory (searched recursively) or glob of .dbml files.'),
+    out_dir: Path = typer.Option(..., file_okay=False, help=f'Where outputs and {MANIFEST_NAME} are written.'),
+    workers: int = typer.Option(1, min=1, help='Size of the process pool shared by all files.'),
+    bytecode: bool = typer.Option(False, '--bytecode', help='Also write reproducible __pycache__ bytecode (checked hash).'),
+) -> None:
+    files = find_inputs(inputs)
+    if not files:
+        typer.echo(f'no .dbml files found in {inputs}', err=True)
+        raise typer.Exit(1)
+
+    entries = run_batch(files, out_dir, workers=workers, bytecode=bytecode)
+    failed = [entry for entry in entries if entry.error is not None]
+    for entry in failed:
+        typer.echo(f'{entry.input}: {entry.error}', err=True)
+    typer.echo(f'converted {len(entries) - len(failed)}/{len(entries)} file(s), manifest: {out_dir / MANIFEST_NAME}')
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command('compile')
+def compile_schema(
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, readable=True),
+    out: Path = typer.Option(None, dir_okay=False, help=f'Defaults to FILE with a {binary.SCHEMA_SUFFIX} suffix.'),
+) -> None:
+    out = file.with_suffix(binary.SCHEMA_SUFFIX) if out is None else out
+    store = load_store(file)
+    binary.dump(store, out)
+    typer.echo(f'compiled {len(store)} table(s), {store.field_count} field(s) into {out}')
+
+
+@app.command('diff')
+def diff(
+    old: Path = typer.Argument(..., exists=True, dir_okay=False, readable=True),
+    new: Path = typer.Argument(..., exists=True, dir_okay=False, readable=True),
+    migration: Path = typer.Option(None, dir_okay=False, help='Write a playhouse.migrate script applying the changes.'),
+    models_module: str = typer.Option('models', help='Module the migration imports the new models from.'),
+    affected: Path = typer.Option(None, dir_okay=False, help='Write the regenerated models of added or changed tables only.'),
+) -> None:
+    # the CLI owns the process: no collections while reading schemas, which create no garbage
+    with gc_paused():
+        new_tables = read_tables(new)
+        schema_diff = diff_tables(read_tables(old), new_tables)
+    if schema_diff:
+        typer.echo(schema_diff.summary())
+    if migration is not None:
+        migration.write_text(render_migration(schema_diff, models_module))
+    if affected is not None:
+        with open(affected, 'w') as f:
+            f.writelines(render_affected(schema_diff, new_tables))
+    if schema_diff:
+        raise typer.Exit(1)
+
+
+@app.command('validate')
+def validate(
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, readable=True),
+    json_output: bool = typer.Option(False, '--json', help='Print the report as JSON.'),
+) -> None:
+    if file.suffix in (binary.SCHEMA_SUFFIX, '.py', *SQLITE_SUFFIXES):
+        # no DBML text to check line by line, only the references between tables
+        with gc_paused():
+            tables = read_tables(file)
+        report = validate_tables(tables, str(file))
+    else:
+        report = validate_file(file)
+    if json_output:
+        typer.echo(json.dumps(report.as_dict(), indent=2))
+    else:
+        for issue in report.issues:
+            typer.echo(str(issue), err=True)
+        typer.echo(f'{report.tables} table(s), {report.fields} field(s), {len(report.issues)} issue(s)')
+    if not report.ok:
+        raise typer.Exit(1)
 
 
 if __name__ == "__main__":
-    typer.run(main)
+    app()
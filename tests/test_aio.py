@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from erd_converter import aio
+from erd_converter.convert import iterate_tables_from_uml_file
+from erd_converter.uml.aio import AsyncUMLIterator
+
+
+DBML = b'''table user {
+  id int [pk]
+  name varchar
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+}
+'''
+
+
+async def _collect_tables(data: bytes, chunk_size: int) -> list[str]:
+    return [table.name async for table in AsyncUMLIterator(aio.BytesStream(data), chunk_size=chunk_size)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+def test_async_iterator(chunk_size: int):
+    assert asyncio.run(_collect_tables(DBML, chunk_size)) == ['user', 'post']
+
+
+def test_async_iterator_rejects_unterminated_table():
+    with pytest.raises(ValueError):
+        asyncio.run(_collect_tables(DBML + b'table tag {\n  id int\n', 16))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+def test_async_iterator_accepts_trailing_comments(chunk_size: int):
+    data = DBML + b'\n// end of schema\n\n'
+    assert asyncio.run(_collect_tables(data, chunk_size)) == ['user', 'post']
+
+
+def test_async_iterator_rejects_trailing_text():
+    with pytest.raises(ValueError):
+        asyncio.run(_collect_tables(DBML + b'tabel tag\n', 16))
+
+
+def test_convert_many_matches_sync(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_bytes(DBML)
+    expected = ''.join(iterate_tables_from_uml_file(filepath))
+
+    async def run() -> list[str]:
+        converter = aio.AsyncConverter(limit=2)
+        return await converter.convert_many([DBML, filepath, str(filepath), aio.BytesStream(DBML)])
+
+    assert asyncio.run(run()) == [expected] * 4
+
+
+def test_convert_orders_forward_references():
+    post, user = DBML.split(b'\n\n')[1], DBML.split(b'\n\n')[0] + b'\n'
+    text = asyncio.run(aio.convert(post + user, chunk_size=7))
+    assert text.index('class User(') < text.index('class Post(')
+    unsorted = asyncio.run(aio.convert(post + user, chunk_size=7, sort=False))
+    assert unsorted.index('class Post(') < unsorted.index('class User(')
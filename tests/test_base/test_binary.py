@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+
+from erd_converter.base import binary
+from erd_converter.convert import convert_file_to
+from erd_converter.uml.store import load_store
+
+
+DBML = '''table user {
+  id int [pk]
+  name varchar(64) [null]
+  tags array[varchar(32) [null]]
+  meta json [null]
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+  parent_id int [null, ref: > post.id]
+  missing_id int [ref: > missing.id]
+  created datetime
+  score float [null]
+}
+'''
+
+
+@pytest.fixture
+def dbml_file(tmp_path: Path) -> Path:
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    return filepath
+
+
+@pytest.mark.parametrize('copy', [False, True])
+def test_round_trip(dbml_file: Path, tmp_path: Path, copy: bool):
+    store = load_store(dbml_file)
+    path = tmp_path / 'schema.erds'
+    binary.dump(store, path)
+
+    loaded = binary.load(path, copy=copy)
+    assert loaded.names == store.names
+    assert list(loaded.tables()) == list(store.tables())
+    assert loaded.table_index('post') == 1
+    assert loaded.foreign_keys_into('user') == store.foreign_keys_into('user')
+    assert loaded.dangling_foreign_keys() == store.dangling_foreign_keys()
+    assert isinstance(loaded.type_codes, memoryview) != copy
+
+
+def test_loads_is_deterministic(dbml_file: Path):
+    store = load_store(dbml_file)
+    data = binary.dumps(store)
+    assert binary.dumps(binary.loads(data)) == data
+
+
+def test_rejects_corrupted_data(dbml_file: Path):
+    data = bytearray(binary.dumps(load_store(dbml_file)))
+    with pytest.raises(binary.SchemaFormatError, match='Not a compiled schema'):
+        binary.loads(b'XXXX' + bytes(data[4:]))
+    with pytest.raises(binary.SchemaFormatError, match='Truncated'):
+        binary.loads(bytes(data[:8]))
+
+    version = bytearray(data)
+    version[4] = 99
+    with pytest.raises(binary.SchemaFormatError, match='version 99'):
+        binary.loads(bytes(version))
+
+    data[-8] ^= 0xFF
+    with pytest.raises(binary.SchemaFormatError, match='Checksum'):
+        binary.loads(bytes(data))
+    # without verification the damage goes unnoticed
+    binary.loads(bytes(data), verify=False)
+
+
+def test_convert_compiled_schema(dbml_file: Path, tmp_path: Path):
+    path = tmp_path / 'schema.erds'
+    binary.dump(load_store(dbml_file), path)
+    for sort in (False, True):
+        expected = io.StringIO()
+        convert_file_to(dbml_file, expected, sort=sort)
+        compiled = io.StringIO()
+        convert_file_to(path, compiled, sort=sort)
+        assert compiled.getvalue() == expected.getvalue()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+
+from erd_converter import base as bf
+from erd_converter.base.converter import build_converter, get_converter
+from erd_converter.peewee import field as peewee_field
+from erd_converter.peewee.table import PeeweeTable
+from erd_converter.uml import field as uml_field
+
+
+def test_converter_copies_shared_attributes():
+    convert = get_converter(peewee_field.PeeweeForeignKeyField, bf.ForeignKeyField)
+    field = peewee_field.PeeweeForeignKeyField('user_id', 'int', 'user', '>', 'id', nullable=True, lazy_load=True)
+    assert convert(field) == bf.ForeignKeyField('user_id', 'int', 'user', '>', 'id', nullable=True)
+    assert get_converter(peewee_field.PeeweeForeignKeyField, bf.ForeignKeyField) is convert
+
+
+def test_converter_requires_mandatory_attributes():
+    with pytest.raises(TypeError):
+        build_converter(bf.Integer, bf.Varchar)
+
+
+def test_array_subfield_round_trip():
+    uml = uml_field.create_uml_field('tags array[varchar(64) [null]]')
+    field = uml.to_field()
+    assert field == bf.Array('tags', bf.Varchar('default', 64, nullable=True))
+
+    peewee = peewee_field.PeeweeArrayField.from_field(field)
+    assert isinstance(peewee.subfield, peewee_field.PeeweeVarcharField)
+    assert peewee.to_field() == field
+    assert uml_field.UMLArrayField.from_field(field).subfield == uml.subfield
+
+
+def test_table_round_trip():
+    table = bf.Table('user', [bf.Integer('id', primary_key=True), bf.Json('meta', nullable=True)])
+    assert PeeweeTable.from_table(table).to_table() == table
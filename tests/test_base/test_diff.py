@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from erd_converter import base as bf
+from erd_converter.base.diff import FieldChange, diff_tables
+
+
+OLD = [
+    bf.Table('user', [bf.Integer('id', primary_key=True), bf.Varchar('name', 64), bf.Varchar('email', 256)]),
+    bf.Table('post', [bf.Integer('id', primary_key=True), bf.ForeignKeyField('author_id', 'int', 'user', '>', 'id')]),
+    bf.Table('legacy', [bf.Integer('id', primary_key=True)]),
+]
+NEW = [
+    bf.Table('user', [
+        bf.Integer('id', primary_key=True),
+        bf.Varchar('name', 128),
+        bf.Varchar('email', 256, nullable=True),
+        bf.Json('meta', nullable=True),
+    ]),
+    # same fields in another order
+    bf.Table('post', [bf.ForeignKeyField('author_id', 'int', 'user', '>', 'id'), bf.Integer('id', primary_key=True)]),
+    bf.Table('tag', [bf.Integer('id', primary_key=True)]),
+]
+
+
+def test_identical_schemas():
+    assert not diff_tables(OLD, OLD)
+
+
+def test_diff_tables():
+    diff = diff_tables(OLD, NEW)
+    assert [table.name for table in diff.added] == ['tag']
+    assert [table.name for table in diff.removed] == ['legacy']
+    (change,) = diff.changed
+    assert change.name == 'user'
+    assert change.added == [bf.Json('meta', nullable=True)]
+    assert change.removed == []
+    assert change.changed == [
+        FieldChange(bf.Varchar('name', 64), bf.Varchar('name', 128)),
+        FieldChange(bf.Varchar('email', 256), bf.Varchar('email', 256, nullable=True)),
+    ]
+    assert [field_change.only_nullable for field_change in change.changed] == [False, True]
+    assert diff.affected == {'user', 'tag'}
+    assert diff.summary().splitlines() == ['+ tag', '- legacy', '~ user', '    + meta', '    ~ name', '    ~ email']
+
+
+def test_removed_fields_and_type_change():
+    old = [bf.Table('t', [bf.Integer('a'), bf.Integer('b')])]
+    new = [bf.Table('t', [bf.Varchar('a', 10)])]
+    (change,) = diff_tables(old, new).changed
+    assert change.removed == [bf.Integer('b')]
+    assert not change.changed[0].only_nullable
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from erd_converter import base as bf
+from erd_converter import convert
+from erd_converter.base.graph import Reference, SchemaIndex, topological_order
+from erd_converter.peewee.table import ordered_tables
+
+
+def fk(name: str, ref_table: str, ref_field: str = 'id') -> bf.ForeignKeyField:
+    return bf.ForeignKeyField(name, 'int', ref_table, '>', ref_field)
+
+
+def test_topological_order_keeps_file_order_when_possible():
+    ordering = topological_order(['post', 'user', 'tag'], [[('author_id', 'user')], [], []])
+    assert ordering.order == [1, 2, 0]
+    assert ordering.deferred == {}
+
+
+def test_topological_order_breaks_cycles():
+    ordering = topological_order(
+        ['a', 'b', 'c', 'd'],
+        [[('b_id', 'b')], [('c_id', 'c')], [('a_id', 'a'), ('c_id', 'c')], [('a_id', 'a')]],
+    )
+    assert ordering.order == [0, 2, 3, 1]
+    assert ordering.deferred == {0: {'b_id'}}
+
+
+def test_schema_index_finds_dangling_references():
+    index = SchemaIndex([
+        bf.Table('user', [bf.Integer('id', primary_key=True)]),
+        bf.Table('post', [fk('author_id', 'user'), fk('editor_id', 'user', 'uuid'), fk('tag_id', 'tag')]),
+    ])
+    assert index.resolve(index.references[0]) == bf.Integer('id', primary_key=True)
+    assert index.dangling() == [
+        Reference('post', 'editor_id', 'user', 'uuid'),
+        Reference('post', 'tag_id', 'tag', 'id'),
+    ]
+
+
+def test_ordered_tables_defer_cycle_and_self_reference():
+    tables = ordered_tables([
+        bf.Table('employee', [bf.Integer('id', primary_key=True), fk('manager_id', 'employee'), fk('team_id', 'team')]),
+        bf.Table('team', [bf.Integer('id', primary_key=True), fk('lead_id', 'employee')]),
+    ])
+    assert [table.name for table in tables] == ['employee', 'team']
+    lines = str(tables[0]).splitlines()
+    assert "    manager_id = ForeignKeyField('self', field='id', lazy_load=False)" in lines
+    assert "    team_id = DeferredForeignKey('Team', field='id', lazy_load=False)" in lines
+    assert "    lead_id = ForeignKeyField(Employee, field='id', lazy_load=False)" in str(tables[1]).splitlines()
+
+
+def test_sorted_output_is_the_same_on_every_path(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(
+        'table post {\n  id int [pk]\n  author_id int [ref: > user.id]\n}\n\n'
+        'table user {\n  id int [pk]\n  // ref: > post.id\n  pinned_id int [null, ref: > post.id]\n}\n'
+    )
+    expected = ''.join(str(table) for table in ordered_tables(
+        [bf.Table('post', [bf.Integer('id', primary_key=True), fk('author_id', 'user')]),
+         bf.Table('user', [bf.Integer('id', primary_key=True), bf.ForeignKeyField('pinned_id', 'int', 'post', '>', 'id', nullable=True)])]
+    ))
+    assert expected.index('class Post') < expected.index('class User')
+    assert "DeferredForeignKey('User'" in expected
+
+    stream = io.StringIO()
+    convert.convert_file_to(filepath, stream, sort=True)
+    assert stream.getvalue() == expected
+    assert ''.join(convert.iterate_tables_from_uml_file(filepath, sort=True)) == expected
+    assert ''.join(convert.iterate_tables_parallel(filepath, 2, sort=True)) == expected
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from erd_converter import base as bf
+from erd_converter.base.store import SchemaStore, TypeCode
+from erd_converter.uml.iterator import UMLIterator
+from erd_converter.uml.store import load_store
+
+
+DBML = '''table user {
+  id int [pk]
+  name varchar(64) [null]
+  tags array[varchar(32) [null]]
+  flags array[boolean]
+  meta json [null]
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+  editor_id int [null, ref: > user.id]
+  parent_id int [null, ref: > post.id]
+  missing_id int [ref: > missing.id]
+  created datetime
+  score float [null]
+  blob bytea
+}
+'''
+
+
+@pytest.fixture
+def dbml_file(tmp_path: Path) -> Path:
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    return filepath
+
+
+def test_store_matches_object_model(dbml_file: Path):
+    with UMLIterator(dbml_file) as uml:
+        tables = [table.to_table() for table in uml]
+
+    assert list(load_store(dbml_file).tables()) == tables
+    assert list(SchemaStore.from_tables(tables).tables()) == tables
+
+
+def test_store_queries(dbml_file: Path):
+    store = load_store(dbml_file)
+    assert len(store) == 2
+    assert store.field_count == 13
+
+    assert [store.qualified_name(i) for i in store.foreign_keys_into('user')] == ['post.author_id', 'post.editor_id']
+    assert [store.qualified_name(i) for i in store.nullable_foreign_keys_into('user')] == ['post.editor_id']
+    assert [store.qualified_name(i) for i in store.dangling_foreign_keys()] == ['post.missing_id']
+    assert len(store.fields_of_type(TypeCode.ARRAY)) == 2
+    assert store.ref_tables[store.foreign_keys_into('post')[0]] == store.table_index('post')
+
+
+def test_store_interns_names():
+    store = SchemaStore.from_tables([
+        bf.Table('a', [bf.Integer('id', primary_key=True)]),
+        bf.Table('b', [bf.Integer('id', primary_key=True)]),
+    ])
+    assert store.names.count('id') == 1
+
+
+def test_load_store_rejects_truncated_file(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text('table user {\n  id int [pk]\n}\n\ntable post {\n  id int [pk]\n')
+    with pytest.raises(ValueError, match='`post` is not closed'):
+        load_store(filepath)
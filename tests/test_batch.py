@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from erd_converter import batch
+
+
+@pytest.fixture
+def inputs(tmp_path: Path) -> Path:
+    root = tmp_path / 'schemas'
+    (root / 'billing').mkdir(parents=True)
+    (root / 'users.dbml').write_text('table user {\n  id int [pk]\n}\n')
+    (root / 'billing' / 'invoices.dbml').write_text(
+        'table invoice {\n  id int [pk]\n}\n\ntable line {\n  id int [pk]\n  invoice_id int [ref: > invoice.id]\n}\n'
+    )
+    (root / 'billing' / 'broken.dbml').write_text('table broken {\n  id what\n}\n')
+    return root
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_batch_writes_outputs_and_manifest(tmp_path: Path, inputs: Path, workers: int):
+    files = batch.find_inputs(inputs)
+    assert [p.name for p in files] == ['broken.dbml', 'invoices.dbml', 'users.dbml']
+
+    out_dir = tmp_path / 'out'
+    entries = batch.run_batch(files, out_dir, workers=workers)
+
+    manifest = json.loads((out_dir / batch.MANIFEST_NAME).read_text())
+    by_name = {Path(entry['input']).name: entry for entry in manifest['files']}
+    assert by_name['invoices.dbml']['tables'] == 2
+    assert by_name['broken.dbml']['error'] is not None
+
+    output = out_dir / 'billing' / 'invoices.py'
+    assert by_name['invoices.dbml']['output'] == str(output)
+    assert by_name['invoices.dbml']['output_sha256'] == hashlib.sha256(output.read_bytes()).hexdigest()
+    assert (out_dir / 'users.py').exists()
+    assert len(entries) == 3
+
+
+def test_find_inputs_glob(inputs: Path):
+    assert [p.name for p in batch.find_inputs(str(inputs / '**' / 'in*.dbml'))] == ['invoices.dbml']
+
+
+def test_batch_writes_bytecode(tmp_path: Path):
+    source = tmp_path / 'in'
+    source.mkdir()
+    (source / 'one.dbml').write_text('table user {\n  id int [pk]\n}\n')
+    (entry,) = batch.run_batch(batch.find_inputs(source), tmp_path / 'out', bytecode=True)
+    assert entry.bytecode is not None and Path(entry.bytecode).exists()
+
+
+def test_batch_reports_truncated_file(tmp_path: Path):
+    source = tmp_path / 'in'
+    source.mkdir()
+    (source / 'one.dbml').write_text('table user {\n  id int [pk]\n}\n\ntable post {\n  id int [pk]\n')
+    (entry,) = batch.run_batch(batch.find_inputs(source), tmp_path / 'out')
+    assert entry.error == 'Table `post` is not closed'
+    assert not (tmp_path / 'out' / 'one.py').exists()
+
+
+def test_batch_reports_write_error(tmp_path: Path):
+    source = tmp_path / 'in'
+    source.mkdir()
+    (source / 'one.dbml').write_text('table user {\n  id int [pk]\n}\n')
+    (source / 'two.dbml').write_text('table post {\n  id int [pk]\n}\n')
+    out_dir = tmp_path / 'out'
+    # a directory where the output file should go makes the write fail
+    (out_dir / 'one.py').mkdir(parents=True)
+    one, two = batch.run_batch(batch.find_inputs(source), out_dir)
+    assert one.error is not None and one.output_sha256 is None
+    assert two.error is None and (out_dir / 'two.py').exists()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+from erd_converter.bytecode import compile_module, compile_modules
+
+
+SOURCE = 'VALUE = 42\n\n\ndef answer():\n    return VALUE\n'
+
+
+def test_checked_hash_bytecode(tmp_path: Path):
+    path = tmp_path / 'generated_answer.py'
+    path.write_text(SOURCE)
+    cfile = compile_module(path)
+    assert cfile == Path(importlib.util.cache_from_source(str(path)))
+
+    data = cfile.read_bytes()
+    assert data[:4] == importlib.util.MAGIC_NUMBER
+    # flags: hash based, check source
+    assert int.from_bytes(data[4:8], 'little') == 0b11
+    assert data[8:16] == importlib.util.source_hash(SOURCE.encode())
+
+    sys.path.insert(0, str(tmp_path))
+    try:
+        import generated_answer
+        assert generated_answer.answer() == 42
+        assert generated_answer.__cached__ == str(cfile)
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop('generated_answer', None)
+
+
+def test_bytecode_is_reproducible(tmp_path: Path):
+    first = tmp_path / 'build' / 'pkg'
+    second = tmp_path / 'elsewhere' / 'pkg'
+    outputs = []
+    for directory in (first, second):
+        directory.mkdir(parents=True)
+        (directory / 'models.py').write_text(SOURCE)
+        (directory / 'notes.txt').write_text('skipped')
+        (cfile,) = compile_modules(directory.iterdir(), root=directory.parent)
+        outputs.append(cfile.read_bytes())
+    assert outputs[0] == outputs[1]
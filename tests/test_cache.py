@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import erd_converter
+from erd_converter.cache import TableCache, render_fingerprint, sources_digest
+
+
+def test_key_depends_on_block_and_options(tmp_path: Path):
+    cache = TableCache(tmp_path)
+    assert cache.key(b'table a {\n}\n') == TableCache(tmp_path).key(b'table a {\n}\n')
+    assert cache.key(b'table a {\n}\n') != cache.key(b'table b {\n}\n')
+    assert cache.key(b'table a {\n}\n') != TableCache(tmp_path, options={'deferred': True}).key(b'table a {\n}\n')
+
+
+def test_key_depends_on_package_version(tmp_path: Path, monkeypatch):
+    key = TableCache(tmp_path).key(b'table a {\n}\n')
+    monkeypatch.setattr(erd_converter, '__version__', erd_converter.__version__ + '.post1')
+    render_fingerprint.cache_clear()
+    try:
+        assert TableCache(tmp_path).key(b'table a {\n}\n') != key
+    finally:
+        render_fingerprint.cache_clear()
+
+
+def test_sources_digest_covers_rendering_code(tmp_path: Path):
+    (tmp_path / 'peewee').mkdir()
+    (tmp_path / 'peewee' / 'field.py').write_text("field_type = 'CharField'\n")
+    (tmp_path / 'cli.py').write_text('')
+    digest = sources_digest(tmp_path)
+    (tmp_path / 'cli.py').write_text('# not part of rendering\n')
+    assert sources_digest(tmp_path) == digest
+    (tmp_path / 'peewee' / 'field.py').write_text("field_type = 'TextField'\n")
+    assert sources_digest(tmp_path) != digest
+
+
+def test_get_put(tmp_path: Path):
+    cache = TableCache(tmp_path)
+    key = cache.key(b'block')
+    assert cache.get(key) is None
+    cache.put(key, 'rendered')
+    assert cache.get(key) == 'rendered'
+
+
+def test_evict_least_recently_used(tmp_path: Path):
+    cache = TableCache(tmp_path, max_bytes=20)
+    keys = [cache.key(bytes([i])) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, 'x' * 10)
+        path = tmp_path / key[:2] / f'{key}.py'
+        os.utime(path, (i, i))
+    cache.get(keys[0])
+
+    assert cache.evict() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == cache.get(keys[2]) == 'x' * 10
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import ast
+import io
+from pathlib import Path
+
+import pytest
+
+from erd_converter import convert
+from erd_converter.base.diff import diff_tables
+from erd_converter.cache import TableCache
+
+
+DBML = '''table user {
+  id int [pk]
+  name varchar(64) [null]
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+  title varchar
+  body varchar
+  created datetime
+}
+
+table tag {
+  id int [pk]
+}
+'''
+
+
+@pytest.mark.parametrize(
+    argnames=['weights', 'count', 'expected'],
+    argvalues=[
+        ([4, 6], 2, [(0, 1), (1, 2)]),
+        ([1, 1, 100, 1, 1], 4, [(0, 2), (2, 3), (3, 4), (4, 5)]),
+        ([1] * 10, 3, [(0, 3), (3, 7), (7, 10)]),
+        ([5], 4, [(0, 1)]),
+        ([], 4, []),
+    ],
+)
+def test_plan_shards(weights: list[int], count: int, expected: list[tuple[int, int]]):
+    assert convert.plan_shards(weights, count) == expected
+
+
+def test_parallel_conversion_keeps_table_order(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+
+    expected = ''.join(convert.iterate_tables_from_uml_file(filepath))
+    assert ''.join(convert.iterate_tables_parallel(filepath, workers=2)) == expected
+    assert expected.index('class User') < expected.index('class Post') < expected.index('class Tag')
+
+
+def test_cached_conversion_matches_uncached(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    expected = ''.join(convert.iterate_tables_from_uml_file(filepath))
+
+    cache = TableCache(tmp_path / 'cache')
+    assert ''.join(convert.iterate_tables_from_uml_file(filepath, cache=cache)) == expected
+    assert (cache.hits, cache.misses) == (0, 3)
+    assert ''.join(convert.iterate_tables_from_uml_file(filepath, cache=cache)) == expected
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+@pytest.mark.parametrize('text', ['table bad name here {\n  id int\n}\n', DBML + 'table open {\n  id int\n'])
+def test_cached_conversion_reports_errors_like_uncached(tmp_path: Path, text: str):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(text)
+    with pytest.raises(ValueError):
+        list(convert.iterate_tables_from_uml_file(filepath))
+    with pytest.raises(ValueError):
+        list(convert.iterate_tables_from_uml_file(filepath, cache=TableCache(tmp_path / 'cache')))
+
+
+def test_parallel_conversion_rejects_truncated_file(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML + 'table open {\n  id int\n')
+    with pytest.raises(ValueError, match='`open` is not closed'):
+        list(convert.iterate_tables_parallel(filepath, workers=2))
+
+
+def test_streaming_conversion_matches_strings(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    stream = io.StringIO()
+    convert.convert_file_to(filepath, stream)
+    assert stream.getvalue() == ''.join(convert.iterate_tables_from_uml_file(filepath))
+
+
+def test_generated_module_has_no_drift(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    models = tmp_path / 'models.py'
+    with open(models, 'w') as f:
+        convert.convert_file_to(filepath, f, sort=True)
+
+    assert not diff_tables(convert.read_tables(filepath), convert.read_tables(models))
+    filepath.write_text(DBML.replace('  title varchar\n', ''))
+    diff = diff_tables(convert.read_tables(filepath), convert.read_tables(models))
+    assert [(change.name, [field.name for field in change.added]) for change in diff.changed] == [('post', ['title'])]
+
+
+ROUND_TRIP_DBML = '''table code {
+  code varchar(16) [pk]
+  label varchar(64) [null]
+}
+
+table user {
+  id int [pk]
+  name varchar [not null]
+  active boolean
+  flag boolean [null]
+  meta json [null]
+  born datetime [null]
+  score float
+  raw bytea [null]
+  tags array[varchar(64)]
+  nums array[int [null]]
+  parent_id int [null, ref: > user.id]
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+  code_id varchar [ref: - code.code]
+  editor_id int [null, ref: < user.id]
+}
+'''
+
+
+def test_generated_models_round_trip(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(ROUND_TRIP_DBML)
+    models = tmp_path / 'models.py'
+    with open(models, 'w') as f:
+        convert.convert_file_to(filepath, f, sort=True)
+    assert not diff_tables(convert.read_tables(models), convert.read_tables(filepath))
+
+
+def test_defer_forward_foreign_keys(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    # `post` references `user` defined before it and `tag` defined after it
+    filepath.write_text(DBML.replace('  title varchar\n', '  tag_id int [ref: > tag.id]\n'))
+    stream = io.StringIO()
+    convert.convert_file_to(filepath, stream, defer_forward=True)
+    text = stream.getvalue()
+    assert "tag_id = DeferredForeignKey('Tag', field='id', lazy_load=False)" in text
+    assert 'author_id = ForeignKeyField(User, ' in text
+    # file order is kept
+    assert text.index('class User') < text.index('class Post') < text.index('class Tag')
+
+    # peewee resolves a deferred key only when its model is created later
+    defined = set()
+    for node in ast.parse(text).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for call in ast.walk(node):
+            if isinstance(call, ast.Call) and isinstance(call.func, ast.Name):
+                if call.func.id == 'DeferredForeignKey':
+                    assert call.args[0].value not in defined | {node.name}
+                elif call.func.id == 'ForeignKeyField':
+                    assert call.args[0].id in defined
+        defined.add(node.name)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from erd_converter import base as bf
+from erd_converter.base.diff import diff_tables
+from erd_converter.peewee.migrate import field_expression, render_affected, render_migration
+
+
+OLD = [
+    bf.Table('user', [bf.Integer('id', primary_key=True), bf.Varchar('name', 64), bf.Integer('age')]),
+    bf.Table('legacy', [bf.Integer('id', primary_key=True)]),
+]
+NEW = [
+    bf.Table('user', [
+        bf.Integer('id', primary_key=True),
+        bf.Varchar('name', 128),
+        bf.Integer('age', nullable=True),
+        bf.ForeignKeyField('manager_id', 'int', 'user', '>', 'id'),
+    ]),
+    bf.Table('tag', [bf.Integer('id', primary_key=True)]),
+]
+
+
+def test_field_expression():
+    assert field_expression(bf.Varchar('name', 64, nullable=True)) == 'CharField(max_length=64, null=True)'
+    assert field_expression(bf.ForeignKeyField('manager_id', 'int', 'user', '>', 'id')) == (
+        "ForeignKeyField(User, field='id', lazy_load=False)"
+    )
+
+
+def test_render_migration():
+    source = render_migration(diff_tables(OLD, NEW), 'app.models')
+    assert 'from app.models import *' in source
+    assert source.endswith(
+        '    database.create_tables([Tag])\n'
+        '    migrate(\n'
+        "        migrator.alter_column_type('user', 'name', CharField(max_length=128)),\n"
+        "        migrator.drop_not_null('user', 'age'),\n"
+        "        migrator.add_column('user', 'manager_id', ForeignKeyField(User, field='id', lazy_load=False)),\n"
+        '    )\n'
+        "    database.execute_sql('DROP TABLE IF EXISTS \"legacy\"')\n"
+    )
+    compile(source, 'migration.py', 'exec')
+    assert render_migration(diff_tables(OLD, OLD)).endswith('    pass\n')
+
+
+def test_render_affected():
+    rendered = list(render_affected(diff_tables(OLD, NEW), NEW))
+    assert [text.split('(')[0].strip() for text in rendered] == ['class User', 'class Tag']
+    assert "manager_id = ForeignKeyField('self', field='id', lazy_load=False)" in rendered[0]
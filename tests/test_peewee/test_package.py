@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import sys
+import typing as tp
+from pathlib import Path
+
+import pytest
+
+from erd_converter import base as bf
+from erd_converter.peewee.package import plan_shards, write_package
+
+
+# stands in for peewee: records foreign key targets and resolves deferred ones on class creation
+STUB_BASE = '''
+_pending = []
+
+
+class BaseModel:
+    def __init_subclass__(cls, **kwargs):
+        for field in list(_pending):
+            if field.model == cls.__name__:
+                field.model = cls
+                _pending.remove(field)
+
+
+class ForeignKeyField:
+    def __init__(self, model, **kwargs):
+        self.model = model
+
+
+class DeferredForeignKey(ForeignKeyField):
+    def __init__(self, model, **kwargs):
+        super().__init__(model)
+        _pending.append(self)
+
+
+def AutoField(**kwargs):
+    return None
+
+
+CharField = IntegerField = AutoField
+'''
+
+
+def fk(name: str, ref_table: str) -> bf.ForeignKeyField:
+    return bf.ForeignKeyField(name, 'int', ref_table, '>', 'id')
+
+
+TABLES = [
+    bf.Table('user', [bf.Integer('id', primary_key=True), fk('team_id', 'team')]),
+    bf.Table('team', [bf.Integer('id', primary_key=True), fk('owner_id', 'user')]),
+    bf.Table('post', [bf.Integer('id', primary_key=True), fk('author_id', 'user')]),
+    bf.Table('tag', [bf.Integer('id', primary_key=True), bf.Varchar('name', 64)]),
+]
+
+
+@pytest.fixture
+def package(tmp_path: Path) -> tp.Iterator[str]:
+    directory = tmp_path / 'generated_models'
+    directory.mkdir()
+    (directory / 'base.py').write_text(STUB_BASE)
+    write_package(TABLES, directory, tables_per_module=1)
+    sys.path.insert(0, str(tmp_path))
+    try:
+        yield directory.name
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in [name for name in sys.modules if name.split('.')[0] == directory.name]:
+            del sys.modules[name]
+
+
+def test_plan_shards():
+    shards = plan_shards(TABLES, tables_per_module=2)
+    # dependency order: tag needs nothing, user's key to team closes the cycle
+    assert [[table.name for table in shard.tables] for shard in shards] == [['tag', 'user'], ['team', 'post']]
+    assert dict(shards[1].imports) == {'models_000': ['User']}
+    assert shards[0].resolves == {'models_001'}
+
+
+def test_models_load_lazily(package: str):
+    import importlib
+
+    module = importlib.import_module(package)
+    assert sorted(module.__all__) == ['Post', 'Tag', 'Team', 'User']
+    assert not any(name.startswith(f'{package}.models_') for name in sys.modules)
+
+    post = module.Post
+    # the user cycle pulls in team; tag stays unloaded
+    loaded = {name.rsplit('.', 1)[1] for name in sys.modules if name.startswith(f'{package}.models_')}
+    assert loaded == {'models_001', 'models_002', 'models_003'}
+    assert post.author_id.model is module.User
+    assert module.User.team_id.model is module.Team
+    assert module.Team.owner_id.model is module.User
+    with pytest.raises(AttributeError):
+        module.Missing
+
+
+def test_base_module_kept_and_stale_modules_removed(tmp_path: Path):
+    directory = tmp_path / 'models'
+    write_package(TABLES, directory, tables_per_module=1)
+    (directory / 'base.py').write_text('# customised\n')
+    write_package(TABLES, directory, tables_per_module=2)
+    assert (directory / 'base.py').read_text() == '# customised\n'
+    assert sorted(path.name for path in directory.glob('models_*.py')) == ['models_000.py', 'models_001.py']
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import gc
+import io
+from pathlib import Path
+
+import pytest
+
+from erd_converter import base as bf
+from erd_converter.convert import convert_file_to
+from erd_converter.peewee import reader
+from erd_converter.uml.iterator import UMLIterator
+
+
+DBML = '''table user_profile {
+  id int [pk]
+  name varchar(64) [null]
+  email varchar
+  tags array[int]
+  flags array[boolean [null]]
+  meta json [null]
+  active boolean
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user_profile.id]
+  parent_id int [ref: > post.id]
+  next_id int [ref: > comment.id]
+  created datetime
+  score float [null]
+  blob bytea
+}
+
+table comment {
+  id int [pk]
+  post_id int [ref: > post.id]
+}
+'''
+
+HAND_WRITTEN = '''
+import peewee
+from playhouse.postgres_ext import ArrayField, JSONField
+
+db = peewee.SqliteDatabase(':memory:')
+
+
+class BaseModel(peewee.Model):
+    class Meta:
+        database = db
+
+
+class Account(BaseModel):
+    id = peewee.BigAutoField()
+    login = peewee.CharField(max_length=32, primary_key=True)
+    owner = peewee.DeferredForeignKey('Person', null=True)
+
+    def __str__(self):
+        return self.login
+
+
+class Person(BaseModel):
+    parent = peewee.ForeignKeyField('self', field='id', null=True)
+    names = ArrayField(peewee.CharField)
+    label = 'not a field'
+'''
+
+
+@pytest.fixture
+def dbml_file(tmp_path: Path) -> Path:
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    return filepath
+
+
+@pytest.mark.parametrize('sort', [False, True])
+def test_round_trip_generated_module(dbml_file: Path, sort: bool):
+    stream = io.StringIO()
+    convert_file_to(dbml_file, stream, sort=sort)
+    with UMLIterator(dbml_file) as uml:
+        expected = {table.name: table for table in (uml_table.to_table() for uml_table in uml)}
+
+    tables = reader.read_source(stream.getvalue())
+    assert {table.name: table for table in tables} == expected
+
+
+def test_hand_written_module():
+    account, person = reader.read_source(HAND_WRITTEN)
+    assert account == bf.Table('account', [
+        bf.Integer('id', primary_key=True),
+        bf.Varchar('login', 32, primary_key=True),
+        bf.ForeignKeyField('owner', 'int', 'person', '>', 'id', nullable=True),
+    ])
+    assert person == bf.Table('person', [
+        bf.ForeignKeyField('parent', 'int', 'person', '>', 'id', nullable=True),
+        bf.Array('names', bf.Varchar('default', 256, nullable=True)),
+    ])
+
+
+def test_unsupported_field_reports_position():
+    source = 'class Item(Model):\n    id = AutoField()\n    addr = IPField()\n'
+    with pytest.raises(reader.PeeweeSyntaxError) as info:
+        reader.read_source(source, 'models.py')
+    assert (info.value.filename, info.value.lineno, info.value.column) == ('models.py', 3, 12)
+    assert 'IPField' in info.value.message
+
+
+def test_standard_field_types():
+    source = (
+        'class Item(Model):\n'
+        '    id = UUIDField(primary_key=True)\n'
+        '    body = TextField(null=True)\n'
+        '    price = DecimalField(max_digits=10, decimal_places=2)\n'
+        '    day = DateField()\n'
+        '    at = TimeField(null=True)\n'
+    )
+    item, = reader.read_source(source)
+    assert item.fields == [
+        bf.Varchar('id', 256, primary_key=True),
+        bf.Varchar('body', 256, nullable=True),
+        bf.Float('price'),
+        bf.DateTime('day'),
+        bf.DateTime('at', nullable=True),
+    ]
+
+
+@pytest.mark.parametrize('declaration', ['CharField(max_length=SIZE)', "CharField(max_length='64')", 'CharField(null=NULLABLE)'])
+def test_non_literal_argument_reports_position(declaration: str):
+    source = f'class Item(Model):\n    name = {declaration}\n'
+    with pytest.raises(reader.PeeweeSyntaxError) as info:
+        reader.read_source(source, 'models.py')
+    assert (info.value.lineno, info.value.column) == (2, 12)
+
+
+def test_field_from_str():
+    assert reader.field_from_str("name = CharField(max_length=64, null=True)") == bf.Varchar('name', 64, nullable=True)
+    assert reader.field_from_str("owner = ForeignKeyField(UserProfile, field='uid')") == bf.ForeignKeyField(
+        'owner', 'int', 'userprofile', '>', 'uid',
+    )
+    with pytest.raises(ValueError):
+        reader.field_from_str('owner = ForeignKeyField("self")')
+    with pytest.raises(ValueError):
+        reader.field_from_str('x = 1')
+
+
+def test_gc_left_to_the_caller(monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(gc, 'disable', lambda: pytest.fail('the reader must not pause the collector'))
+        reader.read_source(HAND_WRITTEN)
+    with reader.gc_paused():
+        assert not gc.isenabled()
+        reader.read_source(HAND_WRITTEN)
+    assert gc.isenabled()
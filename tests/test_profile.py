@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from erd_converter import convert
+from erd_converter.base.base_table import BaseTable
+from erd_converter.cache import TableCache
+from erd_converter.peewee.table import PeeweeTable
+from erd_converter.profile import Profiler, active_profiler
+from erd_converter.uml import field as uml_field
+from erd_converter.uml.iterator import UMLIterator
+
+
+DBML = '''table user {
+  id int [pk]
+  name varchar(64) [null]
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+  title varchar
+}
+'''
+
+
+@pytest.fixture
+def dbml_file(tmp_path: Path) -> Path:
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    return filepath
+
+
+def test_stages_and_histograms(dbml_file: Path):
+    events = []
+    with Profiler() as profiler:
+        profiler.subscribe(lambda stage, seconds, label: events.append((stage, label)))
+        convert.convert_file_to(dbml_file, io.StringIO())
+
+    report = profiler.report()['stages']
+    # two tables plus the call that raises StopIteration
+    assert report['read']['calls'] == 3
+    assert report['parse_field']['calls'] == 5
+    by_type = report['parse_field']['by_type']
+    assert {label: stats['calls'] for label, stats in by_type.items()} == {
+        'UMLForeignKeyField': 1,
+        'UMLIntegerField': 2,
+        'UMLVarcharField': 2,
+    }
+    assert report['from_tokens']['by_type']['UMLIntegerField']['calls'] == 2
+    for stage in ('to_table', 'from_table', 'render'):
+        assert report[stage]['calls'] == 2
+    assert report['write']['calls'] >= 1
+    assert ('parse_field', 'UMLVarcharField') in events
+
+
+def test_cached_path_stages(dbml_file: Path, tmp_path: Path):
+    cache = TableCache(tmp_path / 'cache')
+    list(convert.iterate_tables_from_uml_file(dbml_file, cache=cache))
+    with Profiler() as profiler:
+        list(convert.iterate_tables_from_uml_file(dbml_file, cache=cache, sort=True))
+
+    report = profiler.report()['stages']
+    assert report['read']['calls'] == 1
+    assert report['frame']['calls'] == 1
+    assert {label: stats['calls'] for label, stats in report['cache']['by_type'].items()} == {'hit': 2}
+    assert 'parse_field' not in report
+
+
+def test_uninstall_restores_originals(dbml_file: Path):
+    originals = (
+        UMLIterator.__next__,
+        uml_field.create_uml_field,
+        BaseTable.to_table,
+        BaseTable.__dict__['from_table'],
+        PeeweeTable.render_to,
+        convert.read_blocks,
+        convert.scan_table_spans,
+        TableCache.get,
+    )
+    with Profiler():
+        assert active_profiler() is not None
+        with pytest.raises(RuntimeError):
+            Profiler().install()
+    assert active_profiler() is None
+    assert (
+        UMLIterator.__next__,
+        uml_field.create_uml_field,
+        BaseTable.to_table,
+        BaseTable.__dict__['from_table'],
+        PeeweeTable.render_to,
+        convert.read_blocks,
+        convert.scan_table_spans,
+        TableCache.get,
+    ) == originals
+    assert 'from_tokens' not in uml_field.UMLJsonField.__dict__
+
+
+def test_output_unchanged_and_dump(dbml_file: Path, tmp_path: Path):
+    expected = io.StringIO()
+    convert.convert_file_to(dbml_file, expected)
+    profiled = io.StringIO()
+    with Profiler() as profiler:
+        with profiler.stage('total'):
+            convert.convert_file_to(dbml_file, profiled)
+    assert profiled.getvalue() == expected.getvalue()
+
+    profiler.dump(tmp_path / 'profile.json')
+    report = json.loads((tmp_path / 'profile.json').read_text())
+    assert report['stages']['total']['calls'] == 1
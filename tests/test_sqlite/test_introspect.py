@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import sqlite3
+import typing as tp
+from pathlib import Path
+
+import pytest
+
+from erd_converter import base as bf
+from erd_converter.convert import convert_file_to
+from erd_converter.sqlite import introspect
+
+
+SCHEMA = '''
+CREATE TABLE user (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR(64),
+    email TEXT NOT NULL,
+    active BOOLEAN NOT NULL,
+    meta JSON,
+    avatar BLOB,
+    score REAL,
+    created DATETIME
+);
+CREATE TABLE post (
+    id INTEGER PRIMARY KEY,
+    author_id INTEGER NOT NULL REFERENCES user(id),
+    parent_id INTEGER REFERENCES post,
+    title VARCHAR(128) NOT NULL
+);
+CREATE VIEW active_user AS SELECT * FROM user WHERE active;
+CREATE TABLE counter (id INTEGER PRIMARY KEY AUTOINCREMENT);
+'''
+
+
+@pytest.fixture
+def db_file(tmp_path: Path) -> Path:
+    filepath = tmp_path / 'app.sqlite3'
+    connection = sqlite3.connect(filepath)
+    connection.executescript(SCHEMA)
+    connection.close()
+    return filepath
+
+
+def test_read_tables(db_file: Path):
+    user, post, counter = introspect.read_file(db_file)
+    assert user == bf.Table('user', [
+        bf.Integer('id', primary_key=True),
+        bf.Varchar('name', 64, nullable=True),
+        bf.Varchar('email', 256),
+        bf.Boolean('active'),
+        bf.Json('meta', nullable=True),
+        bf.Bytes('avatar', nullable=True),
+        bf.Float('score', nullable=True),
+        bf.DateTime('created', nullable=True),
+    ])
+    assert post == bf.Table('post', [
+        bf.Integer('id', primary_key=True),
+        bf.ForeignKeyField('author_id', 'int', 'user', '>', 'id'),
+        # no target column: the primary key of the referenced table
+        bf.ForeignKeyField('parent_id', 'int', 'post', '>', 'id', nullable=True),
+        bf.Varchar('title', 128),
+    ])
+    # views and `sqlite_sequence` are not tables of the schema
+    assert counter.name == 'counter'
+
+
+def test_catalog_read_in_two_queries(db_file: Path):
+    connection = sqlite3.connect(db_file)
+    statements = []
+    connection.set_trace_callback(statements.append)
+    try:
+        introspect.read_tables(connection)
+    finally:
+        connection.close()
+    # the table-valued functions show up as nested `-- PRAGMA` entries
+    assert len([statement for statement in statements if not statement.startswith('--')]) == 2
+
+
+@pytest.mark.parametrize(
+    argnames=['declared_type', 'expected'],
+    argvalues=[
+        ('UUID', bf.Varchar('value', 256, nullable=True)),
+        ('STRING', bf.Varchar('value', 256, nullable=True)),
+        ('DECIMAL(10,2)', bf.Float('value', nullable=True)),
+        ('DATETIME2', bf.DateTime('value', nullable=True)),
+        ('POINT', bf.Integer('value', nullable=True)),
+        ('NVARCHAR(36)', bf.Varchar('value', 36, nullable=True)),
+        ('', bf.Bytes('value', nullable=True)),
+    ],
+)
+def test_type_affinity(declared_type: str, expected: tp.Any):
+    assert introspect.read_field('value', declared_type, False, False) == expected
+
+
+def test_unsupported_type():
+    with pytest.raises(ValueError, match='GEOMETRY'):
+        introspect.read_field('shape', 'GEOMETRY', False, False)
+
+
+def test_unusual_declared_type(tmp_path: Path):
+    filepath = tmp_path / 'odd.db'
+    with contextlib.closing(sqlite3.connect(filepath)) as connection:
+        connection.execute('CREATE TABLE token (id UUID PRIMARY KEY, issued DATETIME2 NOT NULL, kind STRING)')
+    (table,) = introspect.read_file(filepath)
+    assert table.fields == [
+        bf.Varchar('id', 256, primary_key=True),
+        bf.DateTime('issued'),
+        bf.Varchar('kind', 256, nullable=True),
+    ]
+
+
+def test_convert_database(db_file: Path):
+    stream = io.StringIO()
+    convert_file_to(db_file, stream, sort=True)
+    text = stream.getvalue()
+    assert text.index('class User(') < text.index('class Post(')
+    assert "author_id = ForeignKeyField(User, field='id', lazy_load=False)" in text
+    assert "parent_id = ForeignKeyField('self', field='id', null=True, lazy_load=False)" in text
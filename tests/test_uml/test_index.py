@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from erd_converter.uml.index import TableIndex, TableSpans, scan_table_spans
+
+
+DBML = (
+    b'// table draft {\n'
+    b'table user {\n'
+    b'  id int [pk]\n'
+    b'  // }\n'
+    b'  meta json [note: \'{}\']\n'
+    b'  }  \r\n'
+    b'\n'
+    b'tables are not { headers }\n'
+    b'table post {\n'
+    b'  user_id int [ref: > user.id]\n'
+    b'}'
+)
+
+
+def test_scan_table_spans():
+    spans = scan_table_spans(DBML)
+    assert isinstance(spans, TableSpans)
+    user_start = DBML.index(b'table user')
+    post_start = DBML.index(b'table post')
+    assert list(spans) == [
+        ('user', user_start, DBML.index(b'\r\n') + 2),
+        ('post', post_start, len(DBML)),
+    ]
+    assert spans[-1] == ('post', post_start, len(DBML))
+    assert list(spans[1:]) == [spans[1]]
+    assert spans.starts.itemsize == 8
+
+
+def test_scan_table_spans_open_table():
+    buffer = DBML.replace(b'tables are not { headers }\n', b'')
+    assert len(scan_table_spans(buffer, strict=True)) == 2
+    assert scan_table_spans(buffer[:-1]).names == ['user']
+    with pytest.raises(ValueError, match='`post` is not closed'):
+        scan_table_spans(buffer[:-1], strict=True)
+
+
+@pytest.mark.parametrize(
+    argnames=['text', 'message'],
+    argvalues=[
+        (b'table bad name here {\n  id int\n}\n', 'Incorrect line table bad name here {'),
+        (b'table user {\n  id int\n}\nid int\n', 'Incorrect firstline in table id int'),
+        (b'}\n// table user {\n', 'Incorrect firstline in table }'),
+    ],
+)
+def test_scan_table_spans_strict_rejects_stray_text(text: bytes, message: str):
+    scan_table_spans(text)
+    with pytest.raises(ValueError, match=message):
+        scan_table_spans(text, strict=True)
+
+
+def test_table_index_round_trip(tmp_path: Path):
+    path = tmp_path / 'schema.dbml'
+    path.write_bytes(DBML)
+    index = TableIndex.build(DBML, os.stat(path))
+    index.save(tmp_path / 'schema.idx')
+    loaded = TableIndex.load(tmp_path / 'schema.idx')
+    assert loaded == index
+    assert loaded.span('post') == index.spans[1][1:]
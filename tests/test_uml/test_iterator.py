@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from erd_converter.uml.index import TableIndex, sidecar_path
+from erd_converter.uml.iterator import UMLIterator
+from erd_converter.uml.table import LazyUMLTable, UMLTable
+
+
+DBML = '''table user {
+  id int [pk]
+  // comment
+  name varchar
+
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+}
+'''
+
+
+@pytest.fixture
+def dbml_file(tmp_path: Path) -> Path:
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML)
+    return filepath
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_iterate_tables(dbml_file: Path, use_mmap: bool):
+    with UMLIterator(dbml_file, use_mmap=use_mmap) as uml:
+        tables = list(uml)
+    assert [table.name for table in tables] == ['user', 'post']
+    assert all(isinstance(table, UMLTable) for table in tables)
+    assert [len(table.fields) for table in tables] == [2, 2]
+
+
+def test_random_access(dbml_file: Path):
+    with UMLIterator(dbml_file, use_mmap=True) as uml:
+        assert uml.table_names() == ['user', 'post']
+        post = uml.get_table('post')
+        assert post.name == 'post'
+        assert [table.name for table in uml.get_tables(['post', 'user'])] == ['post', 'user']
+        with pytest.raises(KeyError):
+            uml.get_table('missing')
+
+
+def test_sidecar_index_invalidated_on_change(dbml_file: Path):
+    with UMLIterator(dbml_file, use_mmap=True) as uml:
+        uml.table_names()
+    index = TableIndex.load(sidecar_path(dbml_file))
+    assert index is not None and index.is_valid_for(os.stat(dbml_file))
+
+    dbml_file.write_text(DBML + 'table tag {\n  id int\n}\n')
+    assert not index.is_valid_for(os.stat(dbml_file))
+    with UMLIterator(dbml_file, use_mmap=True) as uml:
+        assert uml.table_names() == ['user', 'post', 'tag']
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_lazy_tables(dbml_file: Path, use_mmap: bool):
+    with UMLIterator(dbml_file, use_mmap=use_mmap, lazy=True) as uml:
+        tables = list(uml)
+    assert [table.name for table in tables] == ['user', 'post']
+    assert all(isinstance(table, LazyUMLTable) and not table.parsed for table in tables)
+
+    with UMLIterator(dbml_file, use_mmap=use_mmap) as uml:
+        eager = list(uml)
+    for lazy_table, eager_table in zip(tables, eager):
+        assert lazy_table.fields == eager_table.fields
+        assert lazy_table.parsed
+        assert lazy_table.fields is lazy_table.fields
+        assert lazy_table.to_table() == eager_table.to_table()
+
+
+def test_lazy_table_defers_errors():
+    table = LazyUMLTable.from_str(['table broken {', 'id unknown_type', '}'])
+    assert table.name == 'broken'
+    with pytest.raises(ValueError):
+        table.fields
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_unterminated_final_table(tmp_path: Path, use_mmap: bool):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(DBML + 'table tag {\n  id int\n')
+    with UMLIterator(filepath, use_mmap=use_mmap) as uml:
+        assert next(uml).name == 'user'
+        assert next(uml).name == 'post'
+        with pytest.raises(ValueError, match='not closed'):
+            next(uml)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+from erd_converter.uml import field as uml_field
+from erd_converter.uml import lexer
+
+
+@pytest.mark.parametrize(
+    argnames=['line', 'expected'],
+    argvalues=[
+        ('id int [pk]', ('id', 'int', 'int', None, ['pk'])),
+        ('  name   varchar  ', ('name', 'varchar', 'varchar', None, ())),
+        ('description varchar(125) [Null]', ('description', 'varchar(125)', 'varchar', 125, ['null'])),
+        ('user_id int [null, ref: > user.id]', ('user_id', 'int', 'int', None, ['null', 'ref: > user.id'])),
+    ],
+)
+def test_tokenize_field(line: str, expected: tuple):
+    tokens = lexer.tokenize_field(line)
+    assert (tokens.name, tokens.type, tokens.data_type, tokens.size, tokens.options) == expected
+
+
+def test_tokenize_array_field():
+    tokens = lexer.tokenize_field('dependents array[varchar(512) [null]] [not null]')
+    assert tokens.data_type == 'array'
+    assert tokens.options == ['not null']
+    assert tokens.subtype == lexer.FieldTokens('default', 'varchar(512)', 'varchar', 512, None, ['null'])
+
+
+@pytest.mark.parametrize(
+    argnames=['line', 'column'],
+    argvalues=[
+        ('id', 2),
+        ('1id int', 0),
+        ('id int [pk', 7),
+        ('size varchar(12x)', 12),
+        ('tags array[int', 10),
+    ],
+)
+def test_tokenize_field_errors(line: str, column: int):
+    with pytest.raises(lexer.UMLSyntaxError) as exc_info:
+        lexer.tokenize_field(line)
+    assert exc_info.value.column == column
+
+
+def test_long_option_list_is_parsed():
+    options = ', '.join(['note'] * 10_000)
+    field = uml_field.create_uml_field(f'foo int [{options}, null]')
+    assert isinstance(field, uml_field.UMLIntegerField)
+    assert field.nullable
+
+
+def test_fk_detected_by_ref_option_only():
+    field = uml_field.create_uml_field('preference varchar [null]')
+    assert isinstance(field, uml_field.UMLVarcharField)
+
+
+@pytest.mark.parametrize(
+    argnames=['option', 'expected'],
+    argvalues=[
+        ('ref: > user.id', ('user', 'id', '>')),
+        ('ref:<user.id', ('user', 'id', '<')),
+        ('pk', None),
+    ],
+)
+def test_parse_ref_option(option: str, expected: tuple[str, str, str] | None):
+    assert lexer.parse_ref_option(option) == expected
+
+
+def test_identifiers_are_interned():
+    first = lexer.tokenize_field(''.join(['user', '_id int [ref: > ', 'us', 'er.id]']))
+    second = lexer.tokenize_field(''.join(['user_', 'id int [ref: > us', 'er.', 'id]']))
+    assert first.name is second.name
+    first_ref = lexer.parse_ref_option(first.options[0])
+    second_ref = lexer.parse_ref_option(second.options[0])
+    assert first_ref[0] is second_ref[0]
+    assert first_ref[1] is second_ref[1]
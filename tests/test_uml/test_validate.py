@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from erd_converter import base as bf
+from erd_converter.uml.validate import Issue, validate_file, validate_lines, validate_tables
+
+
+VALID = '''table user {
+  id int [pk]
+  // comment
+  name varchar(64) [null]
+}
+
+table post {
+  id int [pk]
+  author_id int [ref: > user.id]
+}
+'''
+
+INVALID = '''table user {
+  id int [pk]
+  name varchar(x)
+  tags array[int
+  id int
+}
+
+table post {
+  author_id int [ref: > users.id]
+  user_id int [ref: > user.uid]
+  kind enum
+
+table comment {
+  id int
+}
+garbage
+table open {
+'''
+
+
+def test_valid_document():
+    report = validate_lines(VALID.splitlines())
+    assert report.ok
+    assert (report.tables, report.fields) == (2, 4)
+
+
+def test_collects_every_issue():
+    report = validate_lines(INVALID.splitlines(keepends=True), 'schema.dbml')
+    assert [(issue.line, issue.column, issue.message) for issue in report.issues] == [
+        (3, 15, 'Invalid size'),
+        (4, 13, 'Unclosed array subtype'),
+        (5, 3, 'Field `id` already defined on line 2'),
+        (8, 1, 'Table `post` is not closed'),
+        (9, 18, 'Reference to unknown table `users`'),
+        (10, 16, 'Reference to unknown field `user.uid`'),
+        (11, 3, 'Cannot find datatype `enum`'),
+        (16, 1, 'Unexpected text outside a table `garbage`'),
+        (17, 1, 'Table `open` is not closed'),
+    ]
+    # fields after a bad line and tables after an unclosed one are still read
+    assert (report.tables, report.fields) == (4, 5)
+    assert str(report.issues[0]) == 'schema.dbml:3:15: Invalid size'
+
+
+def test_validate_file(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(INVALID)
+    report = validate_file(filepath)
+    assert report.file == str(filepath)
+    assert len(report.issues) == 9
+    assert report.as_dict()['issues'][0] == {'file': str(filepath), 'line': 3, 'column': 15, 'message': 'Invalid size'}
+    assert isinstance(report.issues[0], Issue)
+
+
+def test_validate_tables():
+    tables = [
+        bf.Table('user', [bf.Integer('id', primary_key=True)]),
+        bf.Table('post', [
+            bf.ForeignKeyField('author_id', 'int', 'user', '>', 'uuid'),
+            bf.ForeignKeyField('tag_id', 'int', 'tag', '>', 'id'),
+        ]),
+    ]
+    report = validate_tables(tables, 'schema.db')
+    assert (report.tables, report.fields) == (2, 3)
+    assert [str(issue) for issue in report.issues] == [
+        'schema.db:0:0: post.author_id: Reference to unknown field `user.uuid`',
+        'schema.db:0:0: post.tag_id: Reference to unknown table `tag`',
+    ]
+    assert validate_tables(tables[:1]).ok
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from erd_converter import convert
+from erd_converter.cache import TableCache
+from erd_converter.watch import IncrementalConverter
+
+
+USER = 'table user {\n  id int [pk]\n}\n'
+POST = 'table post {\n  id int [pk]\n  author_id int [ref: > user.id]\n}\n'
+
+
+def test_incremental_update_converts_only_changed_blocks(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    res_file = tmp_path / 'models.py'
+    filepath.write_text(USER + POST)
+
+    converter = IncrementalConverter(filepath, res_file)
+    assert converter.update().converted == ['user', 'post']
+    assert not converter.update().changed
+
+    filepath.write_text(USER + POST.replace('[pk]', '[pk]\n  title varchar'))
+    result = converter.update()
+    assert result.converted == ['post']
+    assert res_file.read_text() == ''.join(convert.iterate_tables_from_uml_file(filepath))
+
+    filepath.write_text(USER)
+    result = converter.update()
+    assert (result.converted, result.removed) == ([], 1)
+    assert [table.name for table in converter.tables] == ['user']
+
+
+def test_truncated_file_is_an_error(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    filepath.write_text(USER + POST[:-2])
+    with pytest.raises(ValueError, match='`post` is not closed'):
+        IncrementalConverter(filepath, tmp_path / 'models.py').update()
+
+
+def test_models_written_in_dependency_order(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    res_file = tmp_path / 'models.py'
+    filepath.write_text(POST + USER)
+    IncrementalConverter(filepath, res_file).update()
+    text = res_file.read_text()
+    assert text.index('class User(') < text.index('class Post(')
+
+
+def test_cache_reused_across_converters(tmp_path: Path):
+    filepath = tmp_path / 'schema.dbml'
+    res_file = tmp_path / 'models.py'
+    filepath.write_text(USER + POST)
+    cache = TableCache(tmp_path / 'cache')
+    IncrementalConverter(filepath, res_file, cache=cache).update()
+    assert (cache.hits, cache.misses) == (0, 2)
+    IncrementalConverter(filepath, res_file, cache=cache).update()
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert res_file.read_text() == ''.join(convert.iterate_tables_from_uml_file(filepath))